@@ -1,15 +1,55 @@
 from concurrent import futures
 
 import time
+import queue
 import random
+import threading
+import functools
 import grpc
 from multiprocessing import Value
 
 import proto.RobotSystemCommunication_pb2 as rsc_pb2
 import proto.RobotSystemCommunication_pb2_grpc as rsc_pb2_grpc
+from ai_remote_brain.observation_encoding import (
+    get_encoding,
+    make_observations,
+    FLOAT_LIST)
+from ai_remote_brain.local_policy_brain import LocalPolicyBrain
+from observation_maker.friendly_robots_handler import LOWER_TAGS
+
+
+# What to do when the brain doesn't respond before the deadline.
+# "repeat" repeats the latest actions, "stop" stops the robots and
+# "latest" uses the newest response which has arrived, even a late one.
+REPEAT_LAST_ACTIONS = "repeat"
+STOP_ROBOTS = "stop"
+LATEST_RESPONSE = "latest"
+LATE_RESPONSE_POLICIES = [REPEAT_LAST_ACTIONS, STOP_ROBOTS, LATEST_RESPONSE]
+# Share of a decision step the brain has to respond
+DEFAULT_DEADLINE_RATIO = 0.5
+# Decision steps a late response can still arrive in before the request
+# is cancelled
+RESPONSE_TIMEOUT_STEPS = 5
+# "unary" makes a GetAction call for every request. "stream" keeps one
+# StreamActions stream open and matches the responses to the requests
+# by their sequence ids.
+UNARY_CONNECTION = "unary"
+STREAM_CONNECTION = "stream"
+# "unity" asks the actions from the Unity brain server and "local" runs
+# the policy in the backend's process
+UNITY_BRAIN = "unity"
+LOCAL_BRAIN = "local"
 
 
 class UnityBrainServer(rsc_pb2_grpc.BrainServerServicer):
+    """
+    Client of the brain server. The requests are sent without blocking
+    and the response is waited only until a deadline derived from the
+    decision rate. When the response is late the actions come from the
+    late_response_policy and the game loop keeps running.
+
+    The requests are sent as unary calls or over one long-lived stream.
+    """
     def __init__(self, params):
         self._host_ip = params["brain_server"]["ip"]
         self._port = params["brain_server"]["port"]
@@ -19,30 +59,244 @@ class UnityBrainServer(rsc_pb2_grpc.BrainServerServicer):
 
         self._available = Value('i', 1)
 
+        step_time = 1 / params["decision_rate"]
+        self._deadline = step_time * params["brain_server"].get(
+            "deadline_ratio", DEFAULT_DEADLINE_RATIO)
+        self._response_timeout = step_time * RESPONSE_TIMEOUT_STEPS
+        self._late_response_policy = params["brain_server"].get(
+            "late_response_policy", REPEAT_LAST_ACTIONS).lower()
+        if self._late_response_policy not in LATE_RESPONSE_POLICIES:
+            raise Exception(
+                '\n=====\nUnknown late response policy '
+                f'"{self._late_response_policy}". Expected one of '
+                f'{LATE_RESPONSE_POLICIES}\n=====\n')
+
+        self._connection = params["brain_server"].get(
+            "connection", UNARY_CONNECTION).lower()
+        if self._connection not in [UNARY_CONNECTION, STREAM_CONNECTION]:
+            raise Exception(
+                '\n=====\nUnknown brain server connection '
+                f'"{self._connection}". Expected "{UNARY_CONNECTION}" or '
+                f'"{STREAM_CONNECTION}"\n=====\n')
+        # Requests of the open stream or None if no stream is open
+        self._stream_requests = None
+        # Response futures of the open stream
+        # key : request index : int
+        # value : concurrent.futures.Future : response to the request
+        self._stream_futures = None
+
+        self._observation_encoding = get_encoding(
+            params["brain_server"].get("observation_encoding", FLOAT_LIST))
+        # The tags, the nothing hit flag and the distance
+        self._sector_size = len(LOWER_TAGS) + 2
+
+        # The late responses arrive in gRPC's threads
+        self._lock = threading.Lock()
+        self._request_index = 0
+        # Indices of the requests which missed their deadline and are
+        # still waiting for a response
+        self._late_requests = set()
+        # Index and actions of the newest response
+        self._latest_response = (0, {})
+        self._last_actions = {}
+        self._late_responses = 0
+        self._dropped_responses = 0
+
     @property
     def available(self):
         return self._available.value == 1
 
+    @property
+    def late_responses(self):
+        """
+        return : int
+            Number of responses which missed their deadline
+        """
+        return self._late_responses
+
+    @property
+    def dropped_responses(self):
+        """
+        return : int
+            Number of late responses which were thrown away or never
+            arrived
+        """
+        return self._dropped_responses
+
     def get_actions(self, robot_obs_dict):
+        """
+        Get actions for the robots from the brain. Waits for the response
+        until the deadline at most.
+
+        robot_obs_dict : dict
+            key : aruco_id : int
+            value : dict : lower_obs and upper_obs of the robot
+
+        return : dict
+            key : aruco_id : int
+            value : action : int
+        """
         try:
             brain_req = rsc_pb2.BrainActionRequest()
             for aruco_id in robot_obs_dict.keys():
-                obs = rsc_pb2.Observations(
-                    lowerObservations=robot_obs_dict[aruco_id]['lower_obs'],
-                    upperObservations=robot_obs_dict[aruco_id]['upper_obs'],
-                    arucoMarkerID=aruco_id)
+                obs = make_observations(
+                    aruco_id,
+                    robot_obs_dict[aruco_id],
+                    self._observation_encoding,
+                    self._sector_size)
                 brain_req.observations.append(obs)
-            brain_res = self._stub.GetAction(brain_req)
-            return self._robot_actions_to_dict(brain_res.actions)
+            self._request_index += 1
+            request_index = self._request_index
+            response_future = self._send_request(brain_req, request_index)
+            response_future.add_done_callback(
+                functools.partial(self._on_late_response, request_index))
+
+            try:
+                brain_res = response_future.result(timeout=self._deadline)
+            except (grpc.FutureTimeoutError, futures.TimeoutError):
+                with self._lock:
+                    # The response can arrive right after the timeout
+                    late = not response_future.done()
+                    if late:
+                        self._late_requests.add(request_index)
+                        self._late_responses += 1
+                if late:
+                    actions = self._late_actions(robot_obs_dict)
+                    self._last_actions = actions
+                    return actions
+                brain_res = response_future.result()
+
+            actions = self._robot_actions_to_dict(brain_res.actions)
+            with self._lock:
+                self._latest_response = (request_index, actions)
+            self._last_actions = actions
+            return actions
 
         except grpc.RpcError as e:
             if e.code() == grpc.StatusCode.UNAVAILABLE:
                 self._available.value = 0
                 print("\n====\nUnityBrainServer cannot be reached!\n====\n")
                 raise Exception("Cannot connect to UnityBrainServer")
+            raise e
         except Exception as e:
             raise e
 
+    def close(self):
+        """
+        Close the action stream if it is open
+        """
+        with self._lock:
+            if self._stream_requests is not None:
+                self._stream_requests.put(None)
+                self._stream_requests = None
+
+    def _send_request(self, brain_req, request_index):
+        """
+        return : future
+            Future of the BrainActionResponse
+        """
+        if self._connection == UNARY_CONNECTION:
+            return self._stub.GetAction.future(
+                brain_req, timeout=self._response_timeout)
+
+        response_future = futures.Future()
+        with self._lock:
+            if self._stream_requests is None:
+                self._open_stream()
+            self._stream_futures[request_index] = response_future
+            self._stream_requests.put(rsc_pb2.BrainStreamRequest(
+                seqId=request_index,
+                request=brain_req))
+        return response_future
+
+    def _open_stream(self):
+        # The stream sends the requests from the queue until it gets None
+        stream_requests = queue.Queue()
+        responses = self._stub.StreamActions(
+            iter(stream_requests.get, None))
+        self._stream_requests = stream_requests
+        self._stream_futures = {}
+        threading.Thread(
+            target=self._read_stream,
+            args=(stream_requests, self._stream_futures, responses),
+            name='brain-stream',
+            daemon=True).start()
+
+    def _read_stream(self, stream_requests, stream_futures, responses):
+        """
+        Resolve the response futures of the stream until it ends
+        """
+        error = Exception("UnityBrainServer closed the action stream")
+        try:
+            for response in responses:
+                with self._lock:
+                    response_future = stream_futures.pop(
+                        response.seqId, None)
+                    # The brain answers in order so the older requests
+                    # won't get a response anymore
+                    skipped_futures = [
+                        stream_futures.pop(request_index)
+                        for request_index in list(stream_futures)
+                        if request_index < response.seqId]
+                # The futures' callbacks take the lock
+                for skipped_future in skipped_futures:
+                    skipped_future.cancel()
+                if response_future is not None:
+                    response_future.set_result(response.response)
+        except grpc.RpcError as rpc_error:
+            error = rpc_error
+
+        with self._lock:
+            if self._stream_requests is stream_requests:
+                self._stream_requests = None
+            pending_futures = list(stream_futures.values())
+            stream_futures.clear()
+        for pending_future in pending_futures:
+            pending_future.set_exception(error)
+
+    def _on_late_response(self, request_index, response_future):
+        """
+        Called in a gRPC thread when a response arrives or the request
+        fails. Only the requests which missed their deadline are handled
+        here.
+        """
+        with self._lock:
+            if request_index not in self._late_requests:
+                return
+            self._late_requests.discard(request_index)
+            # Only the "latest" policy uses late responses and only if
+            # no newer response has arrived
+            if response_future.cancelled() or \
+                    response_future.exception() is not None or \
+                    self._late_response_policy != LATEST_RESPONSE or \
+                    request_index < self._latest_response[0]:
+                self._dropped_responses += 1
+                return
+            self._latest_response = (
+                request_index,
+                self._robot_actions_to_dict(
+                    response_future.result().actions))
+
+    def _late_actions(self, robot_obs_dict):
+        """
+        Actions for the robots when the brain's response is late
+
+        return : dict
+            key : aruco_id : int
+            value : action : int
+        """
+        if self._late_response_policy == LATEST_RESPONSE:
+            with self._lock:
+                actions = self._latest_response[1]
+        elif self._late_response_policy == REPEAT_LAST_ACTIONS:
+            actions = self._last_actions
+        else:
+            actions = {}
+        # Robots without an action are stopped
+        return {
+            aruco_id: actions.get(aruco_id, 0)
+            for aruco_id in robot_obs_dict.keys()}
+
     def _robot_actions_to_dict(self, robot_actions):
         robot_actions_dict = {}
         for action in robot_actions:
@@ -50,6 +304,22 @@ class UnityBrainServer(rsc_pb2_grpc.BrainServerServicer):
         return robot_actions_dict
 
 
+def make_brain_server(params):
+    """
+    Create the brain of the brain_server type
+
+    return : UnityBrainServer or LocalPolicyBrain
+    """
+    brain_type = params["brain_server"].get("type", UNITY_BRAIN).lower()
+    if brain_type == UNITY_BRAIN:
+        return UnityBrainServer(params)
+    if brain_type == LOCAL_BRAIN:
+        return LocalPolicyBrain(params)
+    raise Exception(
+        f'\n=====\nUnknown brain server type "{brain_type}". Expected '
+        f'"{UNITY_BRAIN}" or "{LOCAL_BRAIN}"\n=====\n')
+
+
 # For testing
 # Run this with "python -m ai_remote_brain.ai_remote_brain"
 # From the project's root folder
@@ -0,0 +1,144 @@
+'''
+Stand-in for the Unity brain server. Answers the GetAction calls and
+the StreamActions stream with random actions so the backend can be run
+and benchmarked without Unity. The observations are decoded from every
+observation encoding as a reference for the brain.
+
+Run this with "python -m ai_remote_brain.local_brain_server"
+from the project's root folder. The server listens on the brain_server
+port of the params file. With --benchmark=N the server is started in
+this process and N requests are timed with both connection types.
+'''
+
+from absl import app
+from absl import flags
+
+from concurrent import futures
+import copy
+import random
+import time
+
+import grpc
+import numpy as np
+
+import proto.RobotSystemCommunication_pb2 as rsc_pb2
+import proto.RobotSystemCommunication_pb2_grpc as rsc_pb2_grpc
+from ai_remote_brain.ai_remote_brain import (
+    UnityBrainServer,
+    UNARY_CONNECTION,
+    STREAM_CONNECTION)
+from ai_remote_brain.observation_encoding import read_observations
+from utils.utils import parse_options
+
+
+flags.DEFINE_string(
+    "params_file",
+    "params-simu.yaml",
+    "Specify the path to params.yaml file",
+    short_name="p")
+flags.DEFINE_integer(
+    "delay",
+    0,
+    "Specify how many milliseconds the brain thinks before responding",
+    short_name="d")
+flags.DEFINE_integer(
+    "benchmark",
+    0,
+    "Specify how many requests to time with each connection type. "
+    "0 only runs the server.",
+    short_name="b")
+
+FLAGS = flags.FLAGS
+
+NUMBER_OF_ACTIONS = 7
+OBSERVATION_SIZE = 279
+
+
+class LocalBrainServer(rsc_pb2_grpc.BrainServerServicer):
+    def __init__(self, delay=0.0):
+        """
+        delay : float
+            Seconds to wait before responding
+        """
+        self._delay = delay
+
+    def GetAction(self, request, context):
+        return self._get_actions(request)
+
+    def StreamActions(self, request_iterator, context):
+        for stream_request in request_iterator:
+            yield rsc_pb2.BrainStreamResponse(
+                seqId=stream_request.seqId,
+                response=self._get_actions(stream_request.request))
+
+    def _get_actions(self, brain_req):
+        if self._delay > 0:
+            time.sleep(self._delay)
+        brain_res = rsc_pb2.BrainActionResponse()
+        for obs in brain_req.observations:
+            # A real brain would feed these to its policy
+            lower_obs, upper_obs = read_observations(obs)
+            brain_res.actions.append(rsc_pb2.RobotAction(
+                action=random.randrange(NUMBER_OF_ACTIONS),
+                arucoMarkerID=obs.arucoMarkerID))
+        return brain_res
+
+
+def start_server(port, delay=0.0):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    rsc_pb2_grpc.add_BrainServerServicer_to_server(
+        LocalBrainServer(delay), server)
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    return server
+
+
+def benchmark(params, number_of_requests):
+    robot_observations_dict = {}
+    for robot in params["ai_robots"]["robots"]:
+        robot_observations_dict[robot["aruco_code"]] = {
+            'lower_obs': np.random.rand(OBSERVATION_SIZE).astype(np.float32),
+            'upper_obs': np.random.rand(OBSERVATION_SIZE).astype(np.float32)}
+
+    for connection in [UNARY_CONNECTION, STREAM_CONNECTION]:
+        connection_params = copy.deepcopy(params)
+        connection_params["brain_server"]["connection"] = connection
+        # Every response is waited for
+        connection_params["brain_server"]["deadline_ratio"] = 1000
+        brain_server = UnityBrainServer(connection_params)
+        # The first request opens the connection
+        brain_server.get_actions(robot_observations_dict)
+
+        durations = []
+        for _ in range(number_of_requests):
+            start_time = time.perf_counter()
+            brain_server.get_actions(robot_observations_dict)
+            durations.append(time.perf_counter() - start_time)
+        brain_server.close()
+
+        durations = np.array(durations) * 1000
+        print(
+            f'{connection}: mean {np.mean(durations):.3f} ms, '
+            f'median {np.median(durations):.3f} ms, '
+            f'99th percentile {np.percentile(durations, 99):.3f} ms')
+
+
+def main(_):
+    params = parse_options(FLAGS.params_file)
+    port = params["brain_server"]["port"]
+    server = start_server(port, FLAGS.delay / 1000)
+    print(f'Local brain server listening on port {port}')
+    try:
+        if FLAGS.benchmark > 0:
+            params["brain_server"]["ip"] = "localhost"
+            benchmark(params, FLAGS.benchmark)
+        else:
+            server.wait_for_termination()
+    except KeyboardInterrupt:
+        print("Exiting")
+    finally:
+        server.stop(0)
+
+
+if __name__ == "__main__":
+    app.run(main)
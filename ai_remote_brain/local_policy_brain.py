@@ -0,0 +1,276 @@
+'''
+Brain which runs an exported policy in the backend's own process instead
+of asking the Unity brain server over gRPC. Select it with
+brain_server type "local" and give the policy in policy_file:
+
+- ".onnx" is run with onnxruntime on the CPU. A model with one input
+    gets the lower and upper observations one after another and a model
+    with two inputs gets them separately. The output is either the
+    action of every robot or a score for every action.
+- ".npz" is a NumPy multilayer perceptron. weights_0, biases_0,
+    weights_1, biases_1, ... are the layers from the input to the action
+    scores. activation is "relu", "tanh" or "swish" and applied between
+    the layers. The optional observation_mean and observation_std
+    normalize the input.
+
+Run this with "python -m ai_remote_brain.local_policy_brain" from the
+project's root folder to time the policy of the params file. With
+--random_policy=PATH a random NumPy policy is written to PATH first.
+'''
+
+import os
+import time
+
+import numpy as np
+
+
+# Policy file types
+ONNX_POLICY = ".onnx"
+NUMPY_POLICY = ".npz"
+RELU = "relu"
+TANH = "tanh"
+SWISH = "swish"
+# Sizes of the random policy of the timing run
+NUMBER_OF_ACTIONS = 7
+OBSERVATION_SIZE = 279
+
+
+class NumpyPolicy():
+    """
+    Multilayer perceptron read from a .npz file
+    """
+    def __init__(self, policy_file):
+        with np.load(policy_file) as policy:
+            self._weights = []
+            self._biases = []
+            while f'weights_{len(self._weights)}' in policy:
+                layer = len(self._weights)
+                self._weights.append(
+                    policy[f'weights_{layer}'].astype(np.float32))
+                self._biases.append(
+                    policy[f'biases_{layer}'].astype(np.float32))
+            if not self._weights:
+                raise Exception(
+                    f'\n=====\nNumPy policy {policy_file} has no '
+                    'weights_0\n=====\n')
+            self._activation = str(policy.get('activation', RELU))
+            self._observation_mean = policy.get('observation_mean')
+            self._observation_std = policy.get('observation_std')
+        if self._activation not in [RELU, TANH, SWISH]:
+            raise Exception(
+                f'\n=====\nUnknown activation "{self._activation}" in '
+                f'{policy_file}. Expected "{RELU}", "{TANH}" or '
+                f'"{SWISH}"\n=====\n')
+
+    def get_actions(self, lower_obs, upper_obs):
+        """
+        Run all the robots' observations through the policy at once
+
+        lower_obs, upper_obs : numpy.array(float32) [robots, observations]
+
+        return : numpy.array(int) [robots]
+        """
+        values = np.concatenate((lower_obs, upper_obs), axis=1)
+        if self._observation_mean is not None:
+            values = (values - self._observation_mean) / \
+                self._observation_std
+        last_layer = len(self._weights) - 1
+        for layer, (weights, biases) in enumerate(
+                zip(self._weights, self._biases)):
+            values = values @ weights + biases
+            if layer < last_layer:
+                values = self._activate(values)
+        return np.argmax(values, axis=1)
+
+    def _activate(self, values):
+        if self._activation == RELU:
+            return np.maximum(values, 0)
+        if self._activation == TANH:
+            return np.tanh(values)
+        return values / (1 + np.exp(-values))
+
+
+class OnnxPolicy():
+    """
+    ONNX model run with onnxruntime on the CPU
+    """
+    def __init__(self, policy_file, output_name=None):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise Exception(
+                '\n=====\nThe ONNX policy needs onnxruntime. Install it '
+                'with "pip install onnxruntime"\n=====\n')
+        self._session = onnxruntime.InferenceSession(
+            policy_file, providers=['CPUExecutionProvider'])
+        self._input_names = [
+            model_input.name for model_input in self._session.get_inputs()]
+        if len(self._input_names) not in [1, 2]:
+            raise Exception(
+                f'\n=====\nONNX policy {policy_file} has '
+                f'{len(self._input_names)} inputs. Expected 1 or 2\n=====\n')
+        if output_name is None:
+            output_name = self._session.get_outputs()[0].name
+        self._output_names = [output_name]
+
+    def get_actions(self, lower_obs, upper_obs):
+        """
+        Run all the robots' observations through the policy at once
+
+        lower_obs, upper_obs : numpy.array(float32) [robots, observations]
+
+        return : numpy.array(int) [robots]
+        """
+        if len(self._input_names) == 1:
+            inputs = {
+                self._input_names[0]:
+                    np.concatenate((lower_obs, upper_obs), axis=1)}
+        else:
+            inputs = {
+                self._input_names[0]: lower_obs,
+                self._input_names[1]: upper_obs}
+        output = self._session.run(self._output_names, inputs)[0]
+        output = np.reshape(output, (len(lower_obs), -1))
+        if output.shape[1] == 1:
+            return output[:, 0].astype(int)
+        return np.argmax(output, axis=1)
+
+
+def load_policy(brain_params):
+    """
+    brain_params : dict
+        brain_server params
+
+    return : NumpyPolicy or OnnxPolicy
+    """
+    policy_file = brain_params["policy_file"]
+    policy_type = os.path.splitext(policy_file)[1].lower()
+    if policy_type == ONNX_POLICY:
+        return OnnxPolicy(policy_file, brain_params.get("policy_output"))
+    if policy_type == NUMPY_POLICY:
+        return NumpyPolicy(policy_file)
+    raise Exception(
+        f'\n=====\nUnknown policy file type "{policy_type}". Expected '
+        f'"{ONNX_POLICY}" or "{NUMPY_POLICY}"\n=====\n')
+
+
+class LocalPolicyBrain():
+    """
+    Brain running a policy in the backend's process. Has the same
+    interface as UnityBrainServer. The policy answers every request
+    before get_actions returns so no response is ever late.
+    """
+    def __init__(self, params):
+        self._policy = load_policy(params["brain_server"])
+
+    @property
+    def available(self):
+        return True
+
+    @property
+    def late_responses(self):
+        return 0
+
+    @property
+    def dropped_responses(self):
+        return 0
+
+    def get_actions(self, robot_obs_dict):
+        """
+        Get actions for all the robots with one pass through the policy
+
+        robot_obs_dict : dict
+            key : aruco_id : int
+            value : dict : lower_obs and upper_obs of the robot
+
+        return : dict
+            key : aruco_id : int
+            value : action : int
+        """
+        if not robot_obs_dict:
+            return {}
+        aruco_ids = list(robot_obs_dict.keys())
+        lower_obs = np.array(
+            [robot_obs_dict[aruco_id]['lower_obs'] for aruco_id in aruco_ids],
+            dtype=np.float32)
+        upper_obs = np.array(
+            [robot_obs_dict[aruco_id]['upper_obs'] for aruco_id in aruco_ids],
+            dtype=np.float32)
+        actions = self._policy.get_actions(lower_obs, upper_obs)
+        return {
+            aruco_id: int(action)
+            for aruco_id, action in zip(aruco_ids, actions)}
+
+    def close(self):
+        pass
+
+
+def save_random_policy(policy_file, layer_sizes, seed=0):
+    """
+    Write a NumPy policy with random weights, e.g. to try the local
+    brain without a trained policy
+
+    policy_file : str
+    layer_sizes : list(int)
+        Number of values from the input to the action scores
+    """
+    rng = np.random.default_rng(seed)
+    layers = {}
+    for layer, (inputs, outputs) in enumerate(
+            zip(layer_sizes[:-1], layer_sizes[1:])):
+        layers[f'weights_{layer}'] = rng.normal(
+            0, 1 / np.sqrt(inputs), (inputs, outputs)).astype(np.float32)
+        layers[f'biases_{layer}'] = np.zeros(outputs, dtype=np.float32)
+    np.savez(policy_file, activation=np.array(RELU), **layers)
+
+
+def main(_):
+    params = parse_options(FLAGS.params_file)
+    if FLAGS.random_policy:
+        params["brain_server"]["policy_file"] = FLAGS.random_policy
+        save_random_policy(
+            FLAGS.random_policy,
+            [2 * OBSERVATION_SIZE, 128, 128, NUMBER_OF_ACTIONS])
+    brain = LocalPolicyBrain(params)
+
+    robot_observations_dict = {}
+    for robot in params["ai_robots"]["robots"]:
+        robot_observations_dict[robot["aruco_code"]] = {
+            'lower_obs': np.random.rand(OBSERVATION_SIZE).astype(np.float32),
+            'upper_obs': np.random.rand(OBSERVATION_SIZE).astype(np.float32)}
+    durations = []
+    for _ in range(FLAGS.requests):
+        start_time = time.perf_counter()
+        actions = brain.get_actions(robot_observations_dict)
+        durations.append(time.perf_counter() - start_time)
+    durations = np.array(durations) * 1000
+    print(f'Got actions: {actions}')
+    print(
+        f'mean {np.mean(durations):.3f} ms, '
+        f'median {np.median(durations):.3f} ms, '
+        f'99th percentile {np.percentile(durations, 99):.3f} ms')
+
+
+if __name__ == "__main__":
+    from absl import app
+    from absl import flags
+    from utils.utils import parse_options
+
+    flags.DEFINE_string(
+        "params_file",
+        "params-simu.yaml",
+        "Specify the path to params.yaml file",
+        short_name="p")
+    flags.DEFINE_string(
+        "random_policy",
+        "",
+        "Specify a path to write a random NumPy policy to and use",
+        short_name="r")
+    flags.DEFINE_integer(
+        "requests",
+        1000,
+        "Specify how many requests to time",
+        short_name="n")
+
+    FLAGS = flags.FLAGS
+    app.run(main)
@@ -0,0 +1,156 @@
+import numpy as np
+
+import proto.RobotSystemCommunication_pb2 as rsc_pb2
+
+
+# Observation encodings in the params and their protobuf values
+FLOAT_LIST = "floats"
+FLOAT32 = "float32"
+FLOAT16_DISTANCES = "float16"
+UINT8_DISTANCES = "uint8"
+OBSERVATION_ENCODINGS = {
+    FLOAT_LIST: rsc_pb2.FLOAT_LIST,
+    FLOAT32: rsc_pb2.FLOAT32,
+    FLOAT16_DISTANCES: rsc_pb2.FLOAT16_DISTANCES,
+    UINT8_DISTANCES: rsc_pb2.UINT8_DISTANCES,
+}
+# Distance types of the quantized encodings
+DISTANCE_TYPES = {
+    rsc_pb2.FLOAT16_DISTANCES: np.dtype('<f2'),
+    rsc_pb2.UINT8_DISTANCES: np.dtype(np.uint8),
+}
+UINT8_DISTANCE_SCALE = 255
+
+
+def get_encoding(name):
+    """
+    name : str
+        Encoding name from the params
+
+    return : int
+        ObservationEncoding enum value
+    """
+    name = name.lower()
+    if name not in OBSERVATION_ENCODINGS:
+        raise Exception(
+            f'\n=====\nUnknown observation encoding "{name}". Expected '
+            f'one of {list(OBSERVATION_ENCODINGS.keys())}\n=====\n')
+    return OBSERVATION_ENCODINGS[name]
+
+
+def make_observations(aruco_id, robot_obs, encoding, sector_size):
+    """
+    Create the Observations message of a robot
+
+    aruco_id : int
+    robot_obs : dict
+        lower_obs and upper_obs of the robot
+    encoding : int
+        ObservationEncoding enum value
+    sector_size : int
+        Number of values in a sector
+
+    return : rsc_pb2.Observations
+    """
+    if encoding == rsc_pb2.FLOAT_LIST:
+        return rsc_pb2.Observations(
+            lowerObservations=robot_obs['lower_obs'],
+            upperObservations=robot_obs['upper_obs'],
+            arucoMarkerID=aruco_id)
+    return rsc_pb2.Observations(
+        arucoMarkerID=aruco_id,
+        encoding=encoding,
+        sectorSize=sector_size,
+        lowerObservationsPacked=encode_observations(
+            robot_obs['lower_obs'], encoding, sector_size),
+        upperObservationsPacked=encode_observations(
+            robot_obs['upper_obs'], encoding, sector_size))
+
+
+def read_observations(obs):
+    """
+    Read the observations from an Observations message in any encoding
+
+    obs : rsc_pb2.Observations
+
+    return : tuple(numpy.array(float32), numpy.array(float32))
+        Lower and upper observations
+    """
+    if obs.encoding == rsc_pb2.FLOAT_LIST:
+        return (
+            np.array(obs.lowerObservations, dtype=np.float32),
+            np.array(obs.upperObservations, dtype=np.float32))
+    return (
+        decode_observations(
+            obs.lowerObservationsPacked, obs.encoding, obs.sectorSize),
+        decode_observations(
+            obs.upperObservationsPacked, obs.encoding, obs.sectorSize))
+
+
+def encode_observations(observations, encoding, sector_size):
+    """
+    Pack the observations to bytes. The quantized encodings keep only
+    whether a sector's flags are set, so they must be zeros and ones.
+
+    observations : numpy.array(float32)
+        Observations of every sector one after another
+    encoding : int
+        ObservationEncoding enum value other than FLOAT_LIST
+    sector_size : int
+        Number of values in a sector
+
+    return : bytes
+    """
+    if encoding == rsc_pb2.FLOAT32:
+        return np.asarray(observations, dtype='<f4').tobytes()
+
+    sectors = np.reshape(observations, (-1, sector_size))
+    flags = np.packbits(sectors[:, :-1] > 0.5)
+    distances = sectors[:, -1]
+    if encoding == rsc_pb2.UINT8_DISTANCES:
+        distances = np.rint(
+            np.clip(distances, 0, 1) * UINT8_DISTANCE_SCALE)
+    return flags.tobytes() + \
+        distances.astype(DISTANCE_TYPES[encoding]).tobytes()
+
+
+def decode_observations(packed, encoding, sector_size):
+    """
+    Unpack observations packed with encode_observations
+
+    return : numpy.array(float32)
+    """
+    if encoding == rsc_pb2.FLOAT32:
+        return np.frombuffer(packed, dtype='<f4').astype(np.float32)
+
+    distance_type = DISTANCE_TYPES[encoding]
+    flag_count = sector_size - 1
+
+    def packed_size(sector_count):
+        return -(-sector_count * flag_count // 8) + \
+            sector_count * distance_type.itemsize
+
+    # The packed size grows with every sector so the sector count can be
+    # solved from it
+    sector_count = len(packed) * 8 // (flag_count + 8 * distance_type.itemsize)
+    while packed_size(sector_count) < len(packed):
+        sector_count += 1
+    if packed_size(sector_count) != len(packed):
+        raise Exception(
+            f'\n=====\nPacked observations of {len(packed)} bytes don\'t '
+            f'match the sector size {sector_size}\n=====\n')
+
+    flag_bytes = packed_size(sector_count) - \
+        sector_count * distance_type.itemsize
+    flags = np.unpackbits(
+        np.frombuffer(packed[:flag_bytes], dtype=np.uint8),
+        count=sector_count * flag_count)
+    distances = np.frombuffer(
+        packed[flag_bytes:], dtype=distance_type).astype(np.float32)
+    if encoding == rsc_pb2.UINT8_DISTANCES:
+        distances /= UINT8_DISTANCE_SCALE
+
+    sectors = np.empty((sector_count, sector_size), dtype=np.float32)
+    sectors[:, :-1] = flags.reshape((sector_count, flag_count))
+    sectors[:, -1] = distances
+    return sectors.ravel()
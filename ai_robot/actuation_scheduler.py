@@ -0,0 +1,154 @@
+import threading
+import time
+
+
+# Milliseconds before the robot's action timeout expires when the current
+# action is sent again
+DEFAULT_KEEPALIVE_MARGIN = 50
+# Milliseconds the current action is kept alive after the latest decision
+# which asked for it. The robot stops when the decisions stop coming.
+DEFAULT_MAX_KEEPALIVE_TIME = 1000
+STOP_ACTION = 0
+
+
+class ActuationScheduler():
+    """
+    Sends a single robot's actions apart from the decision loop. A new
+    action is sent at once. With keepalive the current action is sent
+    again keepalive_margin milliseconds before the robot's action timeout
+    expires, so the robot keeps moving while a decision takes longer
+    than the timeout, and the decisions repeating the current action are
+    not sent at all. The stop action is never repeated because the robot
+    stops anyway when the action times out.
+    """
+    def __init__(self, robot_frontend, params, keepalive_params):
+        """
+        robot_frontend : RobotFrontend
+        params : dict
+            Robot's params from ai_robots
+        keepalive_params : dict
+            keepalive, keepalive_margin and max_keepalive_time from
+            ai_robots
+        """
+        self._frontend = robot_frontend
+        self._action_timeout = params["action_timeout"] / 1000
+        self._keepalive = keepalive_params.get("keepalive", False)
+        self._keepalive_margin = keepalive_params.get(
+            "keepalive_margin", DEFAULT_KEEPALIVE_MARGIN) / 1000
+        self._max_keepalive_time = keepalive_params.get(
+            "max_keepalive_time", DEFAULT_MAX_KEEPALIVE_TIME) / 1000
+
+        self._condition = threading.Condition()
+        self._action = None
+        self._decision_time = None
+        self._send_time = None
+        self._keepalives = 0
+        self._skipped_actions = 0
+        self._running = self._keepalive
+        if self._keepalive:
+            self._thread = threading.Thread(
+                target=self._run_keepalive, daemon=True)
+            self._thread.start()
+
+    @property
+    def stats(self):
+        """
+        return : dict
+            keepalives : int : number of times the current action was
+                sent again before the robot's action timeout
+            skipped_actions : int : number of decisions which were not
+                sent because the robot was already running the action
+        """
+        with self._condition:
+            return {
+                'keepalives': self._keepalives,
+                'skipped_actions': self._skipped_actions
+            }
+
+    def set_action(self, action):
+        """
+        Send a new action to the robot or skip it if the robot is running
+        it already. Doesn't wait for the robot's response.
+
+        return : Sent action to give to RobotFrontend.wait_action or None
+            if the action was not sent
+        """
+        with self._condition:
+            now = time.time()
+            self._decision_time = now
+            if self._keepalive and action == self._action and \
+                    self._time_left(now) > self._keepalive_margin:
+                self._skipped_actions += 1
+                return None
+            if self._keepalive and action == STOP_ACTION and \
+                    self._action == STOP_ACTION:
+                self._skipped_actions += 1
+                return None
+            self._action = action
+            self._send_time = now
+            sent_action = self._frontend.send_action(action)
+            # Wake up the keepalive to the new timeout
+            self._condition.notify()
+            return sent_action
+
+    def wait_action(self, sent_action):
+        """
+        Wait for the response of an action returned by set_action
+
+        return : Response status or None if the action was not sent
+        """
+        if sent_action is None:
+            return None
+        return self._frontend.wait_action(sent_action)
+
+    def close(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._keepalive:
+            self._thread.join()
+
+    def _time_left(self, now):
+        """
+        return : float
+            Seconds until the robot's current action times out
+        """
+        if self._send_time is None:
+            return 0.0
+        return self._send_time + self._action_timeout - now
+
+    def _get_keepalive_wait_time(self, now):
+        """
+        return : float
+            Seconds until the current action is sent again or None if it
+            is not kept alive
+        """
+        if self._action is None or self._action == STOP_ACTION:
+            return None
+        if now - self._decision_time >= self._max_keepalive_time:
+            # The decisions have stopped, let the robot time out
+            return None
+        return self._time_left(now) - self._keepalive_margin
+
+    def _run_keepalive(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                now = time.time()
+                wait_time = self._get_keepalive_wait_time(now)
+                if wait_time is None or wait_time > 0:
+                    self._condition.wait(wait_time)
+                    continue
+
+                self._keepalives += 1
+                self._send_time = now
+                try:
+                    sent_action = self._frontend.send_action(self._action)
+                except Exception as error:
+                    print(f'Keepalive failed: {error}')
+                    continue
+            try:
+                self._frontend.wait_action(sent_action)
+            except Exception as error:
+                print(f'Keepalive failed: {error}')
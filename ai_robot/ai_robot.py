@@ -1,69 +1,191 @@
 import grpc
 from multiprocessing import Value
 import socket
+import threading
+import time
 
 import proto.RobotSystemCommunication_pb2 as rsc_pb2
 import proto.RobotSystemCommunication_pb2_grpc as rsc_pb2_grpc
+from ai_robot.link_stats import LinkStats, next_request_id
 
 
 UDP_CONNECTION = "udp"
 GRPC_CONNECTION = "grpc"
+BATCH_CONNECTION = "batch"
+# Milliseconds to wait for the acknowledgement of a UDP action before the
+# action is sent again
+DEFAULT_RESEND_TIMEOUT = 50
+# Largest robot response in bytes
+MAX_RESPONSE_SIZE = 100
+
+
+def get_motor_speeds(action, robot_speed, turn_speed, move_turn_speed):
+    """
+    Left and right motor speeds of an action
+
+    action : int
+    robot_speed, turn_speed, move_turn_speed : number
+        Robot's speed settings from the ai_robots params
+
+    return : tuple(number, number)
+        Left and right motor speeds
+    """
+    # Forward
+    if action == 1:
+        # negative speed is forward in bot's orientation
+        return robot_speed, robot_speed
+    # Backward
+    elif action == 2:
+        return -robot_speed, -robot_speed
+    # Turn Clockwise
+    elif action == 3:
+        return turn_speed, -turn_speed
+    # Turn Anti Clockwise
+    elif action == 4:
+        return -turn_speed, turn_speed
+    # Turn right and go forward
+    elif action == 5:
+        return move_turn_speed, robot_speed
+    # Turn left and go forward
+    elif action == 6:
+        return robot_speed, move_turn_speed
+    # No action
+    elif action == 0:
+        return 0, 0
+    else:
+        raise Exception("Unknown action {}".format(action))
 
 
 class RobotFrontend:
-    def __init__(self, params):
-        self._robot_ip = params["ip"]
-        self._robot_port = params["port"]
-        self._robot_conn_type = params["connection_type"]
-        self._channel = grpc.insecure_channel(
-            '{}:{}'.format(self._robot_ip, self._robot_port))
-        self._stub = rsc_pb2_grpc.RobotFrontendStub(self._channel)
+    """
+    Sends the actions to a single robot. A UDP robot has one socket for
+    the whole game and a gRPC robot one channel. send_action doesn't
+    wait for the gRPC response so several robots can be commanded at
+    the same time and their responses waited with wait_action.
+
+    Every UDP request has its own reqId and the robot's responses are
+    received on the same socket by a background thread. The latest
+    action is sent again every resend_timeout milliseconds until it is
+    acknowledged or its action_timeout runs out. The round trip time,
+    loss rate and out of order responses are in link_stats.
+
+    A batch robot's actions are sent by the BatchedActionSender shared
+    by all batch robots.
+    """
+    def __init__(self, params, batch_sender=None):
+        """
+        params : dict
+            Robot's params from ai_robots
+        batch_sender : BatchedActionSender
+            Sender of the batch robots. Only needed if the
+            connection_type is "batch".
+        """
+        self._robot_conn_type = params["connection_type"].lower()
+        self._channel = None
+        self._stub = None
+        self._socket = None
+        self._batch_sender = None
+        if self._robot_conn_type == BATCH_CONNECTION:
+            if batch_sender is None:
+                raise Exception(
+                    '\n=====\nA robot with connection type '
+                    f'"{BATCH_CONNECTION}" needs batch_address in '
+                    'ai_robots\n=====\n')
+            self._aruco_id = params["aruco_code"]
+            self._batch_sender = batch_sender
+        else:
+            self._robot_ip = params["ip"]
+            self._robot_port = params["port"]
+        if self._robot_conn_type == GRPC_CONNECTION:
+            self._channel = grpc.insecure_channel(
+                '{}:{}'.format(self._robot_ip, self._robot_port))
+            self._stub = rsc_pb2_grpc.RobotFrontendStub(self._channel)
+        elif self._robot_conn_type == UDP_CONNECTION:
+            self._socket = socket.socket(
+                socket.AF_INET,  # Internet
+                socket.SOCK_DGRAM)  # UDP
+        elif self._robot_conn_type != BATCH_CONNECTION:
+            raise Exception(
+                '\n=====\nUnknown robot connection type '
+                f'"{self._robot_conn_type}". Expected "{UDP_CONNECTION}", '
+                f'"{GRPC_CONNECTION}" or "{BATCH_CONNECTION}"\n=====\n')
 
         self._robot_speed = params["robot_speed"]
         self._turn_speed = params["turn_speed"]
         self._move_turn_speed = params["move_turn_speed"]
         self._action_timeout = int(params["action_timeout"])
+        self._resend_timeout = params.get(
+            "resend_timeout", DEFAULT_RESEND_TIMEOUT) / 1000
         self._available = Value('i', 1)
+        self._send_start_time = None
+        self._send_latency = -1
+
+        self._lock = threading.Lock()
+        self._next_req_id = 1
+        self._link_stats = LinkStats()
+        # Latest action which is sent again until it is acknowledged:
+        # the RobotRequest, time it was first sent and time it was last
+        # sent. None when there is nothing to resend.
+        self._latest_action = None
+        self._resends = 0
+        self._receiver_running = False
+        if self._socket is not None:
+            # The responses come to the port the requests are sent from
+            self._socket.bind(('', 0))
+            self._socket.settimeout(self._get_receive_timeout())
+            self._receiver_running = True
+            self._receiver = threading.Thread(
+                target=self._receive_responses, daemon=True)
+            self._receiver.start()
 
     @property
     def available(self):
         return self._available.value == 1
 
-    def _get_motor_speeds(self, action):
-        l_motor = None
-        r_motor = None
-
-        # Forward
-        if action == 1:
-            # negative speed is forward in bot's orientation
-            l_motor = self._robot_speed
-            r_motor = self._robot_speed
-        # Backward
-        elif action == 2:
-            l_motor = -self._robot_speed
-            r_motor = -self._robot_speed
-        # Turn Clockwise
-        elif action == 3:
-            l_motor = self._turn_speed
-            r_motor = -self._turn_speed
-        # Turn Anti Clockwise
-        elif action == 4:
-            l_motor = -self._turn_speed
-            r_motor = self._turn_speed
-        # Turn right and go forward
-        elif action == 5:
-            l_motor = self._move_turn_speed
-            r_motor = self._robot_speed
-        # Turn left and go forward
-        elif action == 6:
-            l_motor = self._robot_speed
-            r_motor = self._move_turn_speed
-        # No action
-        elif action == 0:
-            l_motor = 0
-            r_motor = 0
+    @property
+    def send_latency(self):
+        """
+        return : float
+            Seconds from starting to send the latest action until it was
+            sent over UDP or acknowledged over gRPC. -1 if no action has
+            been sent.
+        """
+        return self._send_latency
+
+    @property
+    def link_stats(self):
+        """
+        return : dict
+            rtt : float : smoothed round trip time of the actions in
+                seconds, -1 if none have been acknowledged
+            loss_rate : float : share of the UDP requests which were not
+                acknowledged within the action timeout
+            out_of_order : int : number of UDP responses which arrived
+                after the response of a newer request
+            resends : int : number of UDP actions sent again
+        """
+        if self._batch_sender is not None:
+            link_stats = self._batch_sender.get_link_stats(self._aruco_id)
         else:
-            raise Exception("Unknown action {}".format(action))
+            with self._lock:
+                link_stats = self._link_stats.get_stats()
+        link_stats['resends'] = self._resends
+        return link_stats
+
+    def close(self):
+        self._receiver_running = False
+        if self._socket is not None:
+            self._receiver.join()
+            self._socket.close()
+        if self._channel is not None:
+            self._channel.close()
+
+    def _get_motor_speeds(self, action):
+        l_motor, r_motor = get_motor_speeds(
+            action,
+            self._robot_speed,
+            self._turn_speed,
+            self._move_turn_speed)
         print("Action {}, L: {}, R: {}".format(
               action, int(l_motor), int(r_motor)))
         return int(l_motor), int(r_motor)
@@ -72,30 +194,127 @@ class RobotFrontend:
         '''
         Send motor values to robot
         '''
+        return self.wait_action(self.send_action(action))
+
+    def send_action(self, action):
+        """
+        Send motor values to robot without waiting for the response
+
+        return : Response status of a UDP robot or the gRPC future to
+            give to wait_action
+        """
+        l_motor_speed, r_motor_speed = self._get_motor_speeds(action)
+        motor_values = rsc_pb2.RobotRequest(
+            act=rsc_pb2.RobotActionRequest(
+                leftMotorAction=l_motor_speed,
+                rightMotorAction=r_motor_speed,
+                actionTimeout=self._action_timeout))
+
+        self._send_start_time = time.time()
+        if self._robot_conn_type == GRPC_CONNECTION:
+            return self._stub.MakeAction.future(motor_values.act)
+        if self._robot_conn_type == BATCH_CONNECTION:
+            self._batch_sender.send_action(self._aruco_id, motor_values.act)
+            self._send_latency = time.time() - self._send_start_time
+            return "OK"
+        with self._lock:
+            # Only the latest action is sent again
+            self._latest_action = [motor_values, self._send_start_time, None]
+            self._send_request(motor_values)
+        self._send_latency = time.time() - self._send_start_time
+        return "OK"
+
+    def wait_action(self, sent_action):
+        """
+        Wait for the response of an action sent with send_action
+
+        return : Response status
+        """
+        if self._robot_conn_type != GRPC_CONNECTION:
+            return sent_action
         try:
-            l_motor_speed, r_motor_speed = self._get_motor_speeds(action)
-            motor_values = rsc_pb2.RobotRequest(
-                reqId=1,
-                act=rsc_pb2.RobotActionRequest(
-                    leftMotorAction=l_motor_speed,
-                    rightMotorAction=r_motor_speed,
-                    actionTimeout=self._action_timeout))
-
-            if self._robot_conn_type.lower() == GRPC_CONNECTION:
-                response = self._stub.MakeAction(motor_values)
-                response = response.status
-            elif self._robot_conn_type.lower() == UDP_CONNECTION:
-                sock = socket.socket(socket.AF_INET,  # Internet
-                                     socket.SOCK_DGRAM)  # UDP
-                sock.sendto(motor_values.SerializeToString(),
-                            (self._robot_ip, self._robot_port))
-                response = "OK"
-            return response
+            response = sent_action.result()
+            self._send_latency = time.time() - self._send_start_time
+            with self._lock:
+                self._link_stats.update_rtt(self._send_latency)
+            return response.status
 
         except grpc.RpcError as error:
             if error.code() == grpc.StatusCode.UNAVAILABLE:
                 self._available.value = 0
                 print("\n====\nRobotFrontend cannot be reached!\n====\n")
                 raise Exception("Cannot connect to RobotFrontend")
-        except Exception as error:
             raise error
+
+    def _send_request(self, request):
+        """
+        Send a UDP request with the next request id. Must be called with
+        the lock held.
+        """
+        request.reqId = self._next_req_id
+        self._next_req_id = next_request_id(self._next_req_id)
+        send_time = time.time()
+        self._link_stats.request_sent(request.reqId, send_time)
+        self._latest_action[2] = send_time
+        self._socket.sendto(
+            request.SerializeToString(),
+            (self._robot_ip, self._robot_port))
+
+    def _get_receive_timeout(self):
+        """
+        The receiver wakes up at least this often to resend the latest
+        action and to expire the requests which were never acknowledged
+        """
+        if self._resend_timeout > 0:
+            return min(self._resend_timeout, self._action_timeout / 1000) / 2
+        return self._action_timeout / 1000 / 2
+
+    def _receive_responses(self):
+        while self._receiver_running:
+            try:
+                data = self._socket.recv(MAX_RESPONSE_SIZE)
+            except socket.timeout:
+                data = None
+            except OSError:
+                # The socket was closed
+                break
+            with self._lock:
+                if data is not None:
+                    self._handle_response(data)
+                self._check_pending_requests()
+
+    def _handle_response(self, data):
+        response = rsc_pb2.RobotResponse()
+        try:
+            response.ParseFromString(data)
+        except Exception:
+            print(f'Robot {self._robot_ip} sent an invalid response')
+            return
+        if not self._link_stats.response_received(
+                response.reqId, time.time()):
+            return
+        if self._latest_action is not None and \
+                self._latest_action[0].reqId == response.reqId:
+            self._latest_action = None
+
+    def _check_pending_requests(self):
+        now = time.time()
+        action_timeout = self._action_timeout / 1000
+        self._link_stats.expire_requests(now, action_timeout)
+
+        if self._latest_action is None or self._resend_timeout <= 0:
+            return
+        request, first_send_time, last_send_time = self._latest_action
+        remaining_time = action_timeout - (now - first_send_time)
+        if remaining_time <= self._resend_timeout:
+            # The robot stops before a resent action would be acknowledged
+            self._latest_action = None
+        elif now - last_send_time >= self._resend_timeout:
+            # The robot runs the action only until the original one would
+            # have timed out
+            request.act.actionTimeout = int(remaining_time * 1000)
+            self._resends += 1
+            try:
+                self._send_request(request)
+            except OSError as error:
+                print(f'Resending to robot {self._robot_ip} failed: {error}')
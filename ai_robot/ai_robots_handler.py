@@ -1,21 +1,75 @@
 from ai_robot.ai_robot import RobotFrontend
+from ai_robot.actuation_scheduler import ActuationScheduler
+from ai_robot.batched_action_sender import BatchedActionSender
 
 
 class AIRobotsHandler():
     def __init__(self, params):
+        self._batch_sender = None
+        if "batch_address" in params["ai_robots"]:
+            self._batch_sender = BatchedActionSender(params["ai_robots"])
         self._ai_robots = {}
+        self._schedulers = {}
         for robot_params in params["ai_robots"]["robots"]:
-            ai_robot = RobotFrontend(robot_params)
+            ai_robot = RobotFrontend(robot_params, self._batch_sender)
             aruco_id = robot_params["aruco_code"]
             self._ai_robots[aruco_id] = ai_robot
+            self._schedulers[aruco_id] = ActuationScheduler(
+                ai_robot, robot_params, params["ai_robots"])
+
+    @property
+    def send_latencies(self):
+        """
+        return : dict
+            key : aruco_id : int
+            value : float : send latency of the robot's latest action in
+                seconds
+        """
+        return {
+            aruco_id: ai_robot.send_latency
+            for aruco_id, ai_robot in self._ai_robots.items()}
+
+    @property
+    def link_stats(self):
+        """
+        return : dict
+            key : aruco_id : int
+            value : dict : RobotFrontend.link_stats and
+                ActuationScheduler.stats of the robot
+        """
+        link_stats = {}
+        for aruco_id, ai_robot in self._ai_robots.items():
+            link_stats[aruco_id] = {
+                **ai_robot.link_stats,
+                **self._schedulers[aruco_id].stats}
+        return link_stats
+
+    def close(self):
+        for aruco_id, ai_robot in self._ai_robots.items():
+            self._schedulers[aruco_id].close()
+            ai_robot.close()
+        if self._batch_sender is not None:
+            self._batch_sender.close()
 
     def make_actions(self, actions_dict):
+        # Every robot is commanded before waiting for any response so
+        # the robots get their actions at the same time. The batch
+        # robots' actions go in one datagram.
+        if self._batch_sender is not None:
+            self._batch_sender.open_batch()
+        sent_actions = {}
         for aruco_id in actions_dict.keys():
-            self._ai_robots[aruco_id].make_action(actions_dict[aruco_id])
+            sent_actions[aruco_id] = \
+                self._schedulers[aruco_id].set_action(actions_dict[aruco_id])
+        if self._batch_sender is not None:
+            self._batch_sender.send_batch()
+        for aruco_id, sent_action in sent_actions.items():
+            self._schedulers[aruco_id].wait_action(sent_action)
 
+    @property
     def available(self):
         available = True
-        for aruco_id in actions_dict.keys():
+        for aruco_id in self._ai_robots.keys():
             if self._ai_robots[aruco_id].available is False:
                 available = False
         return available
@@ -0,0 +1,156 @@
+import ipaddress
+import socket
+import threading
+import time
+
+import proto.RobotSystemCommunication_pb2 as rsc_pb2
+from ai_robot.ai_robot import BATCH_CONNECTION
+from ai_robot.link_stats import LinkStats, next_request_id
+
+
+DEFAULT_BATCH_PORT = 50052
+# Largest robot response in bytes
+MAX_RESPONSE_SIZE = 100
+# Seconds between the checks for requests which were never acknowledged
+RESPONSE_POLL_TIME = 0.05
+
+
+class BatchedActionSender():
+    """
+    Sends the actions of the robots with connection_type "batch" in one
+    RobotBatchActionRequest datagram to the broadcast or multicast
+    batch_address of ai_robots. Every robot picks its own action by its
+    aruco marker id and answers with its aruco marker id in the
+    RobotResponse.
+
+    The actions sent between open_batch and send_batch go in the same
+    datagram. An action sent outside of them, e.g. a keepalive, is sent
+    at once in a datagram of its own.
+    """
+    def __init__(self, params):
+        """
+        params : dict
+            ai_robots params
+        """
+        self._address = params["batch_address"]
+        self._port = params.get("batch_port", DEFAULT_BATCH_PORT)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if ipaddress.ip_address(self._address).is_multicast:
+            self._socket.setsockopt(
+                socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+            if "batch_interface" in params:
+                # IP address of the network interface the robots are in
+                self._socket.setsockopt(
+                    socket.IPPROTO_IP,
+                    socket.IP_MULTICAST_IF,
+                    socket.inet_aton(params["batch_interface"]))
+        # The responses come to the port the requests are sent from
+        self._socket.bind(('', 0))
+        self._socket.settimeout(RESPONSE_POLL_TIME)
+
+        # key : aruco_id : int
+        # value : float : seconds the robot runs an action
+        self._action_timeouts = {}
+        # key : aruco_id : int
+        # value : LinkStats
+        self._link_stats = {}
+        for robot in params["robots"]:
+            if robot["connection_type"].lower() != BATCH_CONNECTION:
+                continue
+            aruco_id = robot["aruco_code"]
+            self._action_timeouts[aruco_id] = robot["action_timeout"] / 1000
+            self._link_stats[aruco_id] = LinkStats()
+
+        self._lock = threading.Lock()
+        self._next_req_id = 1
+        self._batch = None
+        self._receiver_running = True
+        self._receiver = threading.Thread(
+            target=self._receive_responses, daemon=True)
+        self._receiver.start()
+
+    def get_link_stats(self, aruco_id):
+        """
+        return : dict
+            LinkStats.get_stats of the robot
+        """
+        with self._lock:
+            return self._link_stats[aruco_id].get_stats()
+
+    def open_batch(self):
+        with self._lock:
+            self._batch = rsc_pb2.RobotBatchActionRequest()
+
+    def send_batch(self):
+        """
+        Send the actions sent after open_batch in one datagram
+        """
+        with self._lock:
+            batch = self._batch
+            self._batch = None
+            if batch is not None and len(batch.actions) > 0:
+                self._send(batch)
+
+    def send_action(self, aruco_id, action_request):
+        """
+        aruco_id : int
+        action_request : rsc_pb2.RobotActionRequest
+        """
+        with self._lock:
+            if self._batch is not None:
+                self._batch.actions.append(rsc_pb2.RobotBatchAction(
+                    arucoMarkerID=aruco_id, act=action_request))
+                return
+            batch = rsc_pb2.RobotBatchActionRequest()
+            batch.actions.append(rsc_pb2.RobotBatchAction(
+                arucoMarkerID=aruco_id, act=action_request))
+            self._send(batch)
+
+    def close(self):
+        self._receiver_running = False
+        self._receiver.join()
+        self._socket.close()
+
+    def _send(self, batch):
+        """
+        Must be called with the lock held
+        """
+        request = rsc_pb2.RobotRequest(reqId=self._next_req_id, batch=batch)
+        self._next_req_id = next_request_id(self._next_req_id)
+        send_time = time.time()
+        for batch_action in batch.actions:
+            self._link_stats[batch_action.arucoMarkerID].request_sent(
+                request.reqId, send_time)
+        self._socket.sendto(
+            request.SerializeToString(), (self._address, self._port))
+
+    def _receive_responses(self):
+        while self._receiver_running:
+            try:
+                data = self._socket.recv(MAX_RESPONSE_SIZE)
+            except socket.timeout:
+                data = None
+            except OSError:
+                # The socket was closed
+                break
+            with self._lock:
+                if data is not None:
+                    self._handle_response(data)
+                now = time.time()
+                for aruco_id, link_stats in self._link_stats.items():
+                    link_stats.expire_requests(
+                        now, self._action_timeouts[aruco_id])
+
+    def _handle_response(self, data):
+        response = rsc_pb2.RobotResponse()
+        try:
+            response.ParseFromString(data)
+        except Exception:
+            print('A batch robot sent an invalid response')
+            return
+        if response.arucoMarkerID not in self._link_stats:
+            print(f'Response from unknown robot {response.arucoMarkerID}')
+            return
+        self._link_stats[response.arucoMarkerID].response_received(
+            response.reqId, time.time())
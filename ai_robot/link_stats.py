@@ -0,0 +1,92 @@
+# Weight of the newest measurement in the smoothed round trip time
+RTT_SMOOTHING = 0.125
+# Request ids are uint32 and wrap around
+REQUEST_ID_RANGE = 2 ** 32
+
+
+class LinkStats():
+    """
+    Round trip time, loss and out of order responses of the acknowledged
+    requests sent to a single robot. Not thread safe, the caller holds
+    its own lock.
+    """
+    def __init__(self):
+        # key : reqId : int
+        # value : float : time the request was sent
+        self._pending_requests = {}
+        self._latest_acked_req_id = None
+        self._rtt = -1
+        self._acked_requests = 0
+        self._lost_requests = 0
+        self._out_of_order_responses = 0
+
+    def request_sent(self, req_id, send_time):
+        self._pending_requests[req_id] = send_time
+
+    def response_received(self, req_id, receive_time):
+        """
+        return : boolean
+            False if the request is unknown, e.g. a duplicate response or
+            a response which arrived after the request was counted lost
+        """
+        send_time = self._pending_requests.pop(req_id, None)
+        if send_time is None:
+            return False
+        self._acked_requests += 1
+        self.update_rtt(receive_time - send_time)
+        if self._latest_acked_req_id is not None and \
+                is_older(req_id, self._latest_acked_req_id):
+            self._out_of_order_responses += 1
+        else:
+            self._latest_acked_req_id = req_id
+        return True
+
+    def expire_requests(self, now, timeout):
+        """
+        Count the requests without a response in timeout seconds lost
+        """
+        for req_id, send_time in list(self._pending_requests.items()):
+            if now - send_time > timeout:
+                del self._pending_requests[req_id]
+                self._lost_requests += 1
+
+    def update_rtt(self, rtt):
+        if self._rtt < 0:
+            self._rtt = rtt
+        else:
+            self._rtt += RTT_SMOOTHING * (rtt - self._rtt)
+
+    def get_stats(self):
+        """
+        return : dict
+            rtt : float : smoothed round trip time in seconds, -1 if no
+                request has been acknowledged
+            loss_rate : float : share of the requests which were not
+                acknowledged in time
+            out_of_order : int : number of responses which arrived after
+                the response of a newer request
+        """
+        resolved_requests = self._acked_requests + self._lost_requests
+        loss_rate = 0.0
+        if resolved_requests > 0:
+            loss_rate = self._lost_requests / resolved_requests
+        return {
+            'rtt': self._rtt,
+            'loss_rate': loss_rate,
+            'out_of_order': self._out_of_order_responses
+        }
+
+
+def next_request_id(req_id):
+    return (req_id + 1) % REQUEST_ID_RANGE
+
+
+def is_older(req_id, other_req_id):
+    """
+    Compare request ids which wrap around
+
+    return : boolean
+        True if req_id was sent before other_req_id
+    """
+    difference = (other_req_id - req_id) % REQUEST_ID_RANGE
+    return 0 < difference < REQUEST_ID_RANGE // 2
@@ -0,0 +1,230 @@
+'''
+Stand-in for the robots' UDP firmware. Every robot of the params file
+with connection type "udp" or "batch" is emulated in its own thread. A
+UDP robot listens on its ip and port, so give the robots loopback
+addresses like 127.0.0.2 and 127.0.0.3 in the params file to run them
+on one machine. The batch robots listen on batch_port, join the
+batch_address if it is a multicast group and pick their own action from
+the RobotBatchActionRequest.
+
+Run this with "python -m ai_robot.robot_emulator -p params.yaml"
+from the project's root folder.
+'''
+
+from absl import app
+from absl import flags
+
+import ipaddress
+import random
+import socket
+import struct
+import threading
+import time
+
+import proto.RobotSystemCommunication_pb2 as rsc_pb2
+from ai_robot.ai_robot import UDP_CONNECTION, BATCH_CONNECTION
+from ai_robot.batched_action_sender import DEFAULT_BATCH_PORT
+from utils.utils import parse_options
+
+
+flags.DEFINE_string(
+    "params_file",
+    "params-prod.yaml",
+    "Specify the path to params.yaml file",
+    short_name="p")
+flags.DEFINE_float(
+    "loss",
+    0.0,
+    "Specify the share of the requests which the robots don't answer",
+    short_name="l")
+flags.DEFINE_integer(
+    "delay",
+    0,
+    "Specify how many milliseconds the robots wait before answering",
+    short_name="d")
+
+FLAGS = flags.FLAGS
+
+MAX_REQUEST_SIZE = 1024
+# Seconds between the checks if the emulator has been stopped
+RECEIVE_TIMEOUT = 0.1
+
+
+class EmulatedRobot():
+    """
+    Receives the RobotRequests of a single robot, keeps the motor
+    commands and answers them like the robot's firmware
+    """
+    def __init__(self, aruco_id, robot_socket, loss=0.0, delay=0.0):
+        """
+        aruco_id : int
+        robot_socket : socket.socket
+            Bound socket from make_robot_socket
+        loss : float
+            Share of the requests which are not answered
+        delay : float
+            Seconds to wait before answering
+        """
+        self._aruco_id = aruco_id
+        self._socket = robot_socket
+        self._socket.settimeout(RECEIVE_TIMEOUT)
+        self._loss = loss
+        self._delay = delay
+        self._lock = threading.Lock()
+        # list(tuple(float, int, int, int)) : time the command was
+        # received, left and right motor action and the action timeout in
+        # milliseconds
+        self._commands = []
+        self._running = False
+        self._thread = None
+
+    @property
+    def commands(self):
+        with self._lock:
+            return list(self._commands)
+
+    def motor_actions(self, now):
+        """
+        return : tuple(int, int)
+            Left and right motor action the robot runs at the given time
+        """
+        with self._lock:
+            if not self._commands:
+                return 0, 0
+            receive_time, l_motor, r_motor, timeout = self._commands[-1]
+        if now - receive_time > timeout / 1000:
+            return 0, 0
+        return l_motor, r_motor
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._socket.close()
+
+    def _run(self):
+        while self._running:
+            try:
+                data, address = self._socket.recvfrom(MAX_REQUEST_SIZE)
+            except socket.timeout:
+                continue
+            request = rsc_pb2.RobotRequest()
+            request.ParseFromString(data)
+            action = self._get_own_action(request)
+            if action is None:
+                continue
+            with self._lock:
+                self._commands.append((
+                    time.time(),
+                    action.leftMotorAction,
+                    action.rightMotorAction,
+                    action.actionTimeout))
+            if random.random() < self._loss:
+                continue
+            if self._delay > 0:
+                time.sleep(self._delay)
+            response = rsc_pb2.RobotResponse(
+                reqId=request.reqId,
+                arucoMarkerID=self._aruco_id,
+                act=rsc_pb2.RobotActionResponse(status=rsc_pb2.OK))
+            self._socket.sendto(response.SerializeToString(), address)
+
+    def _get_own_action(self, request):
+        """
+        return : rsc_pb2.RobotActionRequest
+            Robot's action in the request or None if the request has none
+        """
+        request_type = request.WhichOneof('req')
+        if request_type == 'act':
+            return request.act
+        if request_type == 'batch':
+            for batch_action in request.batch.actions:
+                if batch_action.arucoMarkerID == self._aruco_id:
+                    return batch_action.act
+        return None
+
+
+def make_robot_socket(address, port, multicast_interface=None):
+    """
+    Socket of an emulated robot
+
+    address : str
+        Robot's ip address or, for the batch robots, the batch_address.
+        Several robots can listen on the same batch address.
+    port : int
+    multicast_interface : str
+        IP address of the interface to join a multicast group on
+
+    return : socket.socket
+    """
+    robot_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    robot_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if ipaddress.ip_address(address).is_multicast:
+        robot_socket.bind(('', port))
+        robot_socket.setsockopt(
+            socket.IPPROTO_IP,
+            socket.IP_ADD_MEMBERSHIP,
+            struct.pack(
+                '4s4s',
+                socket.inet_aton(address),
+                socket.inet_aton(multicast_interface or '0.0.0.0')))
+    else:
+        robot_socket.bind((address, port))
+    return robot_socket
+
+
+def make_robots(params, loss=0.0, delay=0.0):
+    """
+    Emulated robots of the ai_robots params
+
+    return : dict
+        key : aruco_id : int
+        value : EmulatedRobot
+    """
+    ai_robots = params["ai_robots"]
+    robots = {}
+    for robot in ai_robots["robots"]:
+        connection_type = robot["connection_type"].lower()
+        if connection_type == UDP_CONNECTION:
+            robot_socket = make_robot_socket(robot["ip"], robot["port"])
+        elif connection_type == BATCH_CONNECTION:
+            robot_socket = make_robot_socket(
+                ai_robots["batch_address"],
+                ai_robots.get("batch_port", DEFAULT_BATCH_PORT),
+                ai_robots.get("batch_interface"))
+        else:
+            print(f'Robot {robot["aruco_code"]} is not a UDP robot, '
+                  'skipping it')
+            continue
+        robots[robot["aruco_code"]] = EmulatedRobot(
+            robot["aruco_code"], robot_socket, loss, delay)
+    return robots
+
+
+def main(_):
+    params = parse_options(FLAGS.params_file)
+    robots = make_robots(params, FLAGS.loss, FLAGS.delay / 1000)
+    for robot in robots.values():
+        robot.start()
+    print(f'Emulating robots {list(robots.keys())}')
+    try:
+        while True:
+            time.sleep(1)
+            now = time.time()
+            for aruco_id, robot in robots.items():
+                l_motor, r_motor = robot.motor_actions(now)
+                print(f'Robot {aruco_id}: {len(robot.commands)} commands, '
+                      f'L: {l_motor}, R: {r_motor}')
+    except KeyboardInterrupt:
+        print("Exiting")
+    finally:
+        for robot in robots.values():
+            robot.stop()
+
+
+if __name__ == "__main__":
+    app.run(main)
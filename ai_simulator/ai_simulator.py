@@ -35,11 +35,32 @@ class UnitySimulation(rsc_pb2_grpc.SimulationServerServicer):
         self._stub = rsc_pb2_grpc.SimulationServerStub(self._channel)
 
         self._available = Value('i', 1)
+        self._frame_sequence = 0
+        self._frame_timestamp = 0.0
+        self._send_latencies = {}
 
     @property
     def available(self):
         return self._available.value == 1
 
+    @property
+    def send_latencies(self):
+        """
+        return : dict
+            key : aruco_id : int
+            value : float : seconds the latest actions took to send. All
+                robots are sent in the same request.
+        """
+        return self._send_latencies
+
+    @property
+    def link_stats(self):
+        """
+        return : dict
+            Always empty. The simulation has no robot links.
+        """
+        return {}
+
     def _decode_image(self, image):
         image = np.frombuffer(image, dtype=np.uint8)
         return cv2.imdecode(image, flags=1)
@@ -47,11 +68,46 @@ class UnitySimulation(rsc_pb2_grpc.SimulationServerServicer):
     def frame_available(self):
         return True
 
+    def wait_for_new_frame(self, timeout=None):
+        # Screen captures are requested on demand so a new frame is
+        # always available
+        return True
+
+    def acquire_frame(self):
+        """
+        Returns : tuple(numpy.array(int8), None)
+            New screen capture and a release token for release_frame
+        """
+        return self.frame(), None
+
+    def release_frame(self, token):
+        # Every screen capture is a new image so there is nothing to release
+        pass
+
+    @property
+    def frame_sequence(self):
+        """
+        Returns : int
+            Sequence number of the frame returned by the latest frame() call
+        """
+        return self._frame_sequence
+
+    @property
+    def frame_timestamp(self):
+        """
+        Returns : float
+            Time, as given by time.time(), when the frame returned by the
+            latest frame() call was requested
+        """
+        return self._frame_timestamp
+
     def stop(self):
         self._available.value = 0
 
     def frame(self):
         try:
+            self._frame_sequence += 1
+            self._frame_timestamp = time.time()
             request = rsc_pb2.SimulationScreenCaptureRequest(
                     widht=self._capture_width,
                     height=self._capture_height,
@@ -77,7 +133,11 @@ class UnitySimulation(rsc_pb2_grpc.SimulationServerServicer):
                                                  action=actions_dict[key])
                 action_req.actions.append(new_action)
             # action_req = rsc_pb2.SimulationActionRequest(actions=actions)
+            start_time = time.time()
             action_res = self._stub.MakeAction(action_req)
+            send_latency = time.time() - start_time
+            self._send_latencies = {
+                key: send_latency for key in actions_dict.keys()}
             return action_res.status
 
         except grpc.RpcError as e:
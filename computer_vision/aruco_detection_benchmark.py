@@ -0,0 +1,135 @@
+'''
+Compares the downscaled aruco detection against the full resolution
+detection on recorded camera images. For every downscale factor the
+detection rate, the corner error and the detection time are printed.
+The full resolution detection is used as the reference.
+
+Run from the repository root, e.g.
+python -m computer_vision.aruco_detection_benchmark -i=recorded_frames/
+'''
+
+from absl import app
+from absl import flags
+
+import copy
+import os
+import time
+
+import numpy as np
+import cv2
+
+from computer_vision.aruco_marker_detector import ArucoMarkerDetector
+from utils.utils import parse_options
+
+
+flags.DEFINE_string(
+    "image_folder",
+    None,
+    "Specify the folder which has the recorded camera images",
+    short_name="i")
+flags.DEFINE_string(
+    "params_file",
+    "params-prod.yaml",
+    "Specify the params file whose detector settings are used",
+    short_name="p")
+flags.DEFINE_list(
+    "downscales",
+    ["2", "4"],
+    "Specify the downscale factors to compare",
+    short_name="d")
+flags.mark_flag_as_required("image_folder")
+
+FLAGS = flags.FLAGS
+
+
+def _read_images(image_folder):
+    image_files = sorted(
+        os.path.join(image_folder, f) for f in os.listdir(
+            image_folder) if f.endswith(".png") or f.endswith(".jpg"))
+    return [cv2.imread(image_file) for image_file in image_files]
+
+
+def _create_detector(params, downscale):
+    params = copy.deepcopy(params)
+    params["image_processing"]["aruco_downscale"] = downscale
+    # Every image is searched fully
+    params["image_processing"]["aruco_tracking"] = False
+    return ArucoMarkerDetector(params)
+
+
+def _detect_all(detector, images):
+    """
+    return : tuple(list(dict), float)
+        Detected corners of every image and the mean detection time
+        in seconds
+        key : aruco_id : int
+        value : numpy.array(float32) [4, 2]
+    """
+    results = []
+    durations = []
+    for image in images:
+        start = time.perf_counter()
+        corners, detected_ids, _ = detector._detect_markers(image)
+        durations.append(time.perf_counter() - start)
+        if detected_ids is None:
+            results.append({})
+            continue
+        results.append({
+            int(aruco_id): np.reshape(corner_list, (4, 2))
+            for aruco_id, corner_list in zip(
+                detected_ids.flatten(), corners)})
+    return results, np.mean(durations)
+
+
+def benchmark(image_folder, params, downscales):
+    images = _read_images(image_folder)
+    if not images:
+        raise Exception(
+            f'\n=====\nNo images found from "{image_folder}"\n=====\n')
+    print(f"{len(images)} images from {image_folder}")
+
+    reference, reference_time = _detect_all(
+        _create_detector(params, 1), images)
+    reference_count = sum(len(markers) for markers in reference)
+    print(
+        f"Full resolution: {reference_count} markers, "
+        f"{reference_time * 1000:.1f} ms per image")
+
+    for downscale in downscales:
+        results, detection_time = _detect_all(
+            _create_detector(params, downscale), images)
+        found_count = 0
+        extra_count = 0
+        corner_errors = []
+        for reference_markers, markers in zip(reference, results):
+            for aruco_id, corner_list in markers.items():
+                if aruco_id not in reference_markers:
+                    extra_count += 1
+                    continue
+                found_count += 1
+                corner_errors.extend(np.linalg.norm(
+                    corner_list - reference_markers[aruco_id], axis=1))
+
+        detection_rate = found_count / max(reference_count, 1)
+        print(f"Downscale {downscale}:")
+        print(
+            f"    detection rate {detection_rate * 100:.1f} % "
+            f"({found_count}/{reference_count}), "
+            f"{extra_count} markers not found at full resolution")
+        if corner_errors:
+            print(
+                f"    corner error mean {np.mean(corner_errors):.3f} px, "
+                f"max {np.max(corner_errors):.3f} px")
+        print(
+            f"    {detection_time * 1000:.1f} ms per image, "
+            f"{reference_time / detection_time:.2f}x speed")
+
+
+def start(_):
+    params = parse_options(FLAGS.params_file)
+    downscales = [int(downscale) for downscale in FLAGS.downscales]
+    benchmark(FLAGS.image_folder, params, downscales)
+
+
+if __name__ == "__main__":
+    app.run(start)
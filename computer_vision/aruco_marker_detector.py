@@ -3,10 +3,31 @@ import math
 import numpy as np
 import cv2
 from cv2 import aruco
+from computer_vision.rectifier import (
+    get_calibration_file,
+    NO_RECTIFICATION,
+    RECTIFY_IMAGE)
 
 
 BORDER_COLOR = (100, 0, 240)
 ANGLE_CORRECTION_DEGREE = 1
+# Marker pose estimation methods. The planar pose computes the position
+# and the heading straight from the corners. The PnP pose estimates the
+# full 3D pose with the camera calibration.
+PLANAR_POSE = "planar"
+PNP_POSE = "pnp"
+# Defaults for the tracking mode which searches markers only near their
+# predicted positions
+DEFAULT_FULL_SEARCH_INTERVAL = 10
+# Frames between the full searches while a friendly marker is missing
+DEFAULT_REACQUIRE_INTERVAL = 3
+DEFAULT_ROI_PADDING = 0.5
+# Marker candidates with a smaller perimeter than this ratio of the tracked
+# marker's perimeter are rejected in the tracking mode
+MIN_ROI_PERIMETER_RATIO = 0.5
+# With a downscale factor above one the markers are detected from a
+# downscaled image and their corners are refined at full resolution
+DEFAULT_DOWNSCALE = 1
 
 
 class ArucoMarkerDetector():
@@ -16,28 +37,87 @@ class ArucoMarkerDetector():
         for item in params["ai_robots"]["robots"]:
             self._friendly_robot_arucos.append(item['aruco_code'])
 
-        self._aruco_detector_parameters = aruco.DetectorParameters_create()
-        # More Aruco detection tuning parameters shown at below link.
-        # http://amroamroamro.github.io/mexopencv/opencv_contrib/aruco_detect_markers_demo.html
-        self._aruco_detector_parameters.cornerRefinementMethod = \
-            aruco.CORNER_REFINE_SUBPIX
-        self._aruco_detector_parameters.cornerRefinementWinSize = 5
-        self._aruco_detector_parameters.minMarkerDistanceRate = 0.05
-        self._aruco_detector_parameters.cornerRefinementMinAccuracy = 0.5
-
-        if 'simulation' in params:
-            file_path = params["simulation"]["calib_params"]
-        elif 'ai_video_streamer' in params:
-            file_path = params["ai_video_streamer"]["calib_params"]
+        self._aruco_detector_parameters = self._create_detector_parameters()
+        # Region of interest searches reject candidates much smaller than
+        # the tracked marker
+        self._roi_detector_parameters = self._create_detector_parameters()
 
+        file_path = get_calibration_file(params)
         with open(file_path) as json_file:
             camera_calib_params = json.load(json_file)
         self._size_of_marker = params["ai_robots"]["aruco_marker_size"]
 
         self._mtx = np.array(camera_calib_params["mtx"], dtype=np.float32)
         self._dist = np.array(camera_calib_params["dist"], dtype=np.float32)
+        # Rectified images have no lens distortion left
+        rectification = params["image_processing"].get(
+            "rectification", NO_RECTIFICATION).lower()
+        if rectification == RECTIFY_IMAGE:
+            self._dist = np.zeros_like(self._dist)
 
         self._length_of_axis = 0.05
+        self._pose_estimation = params["image_processing"].get(
+            "aruco_pose", PNP_POSE).lower()
+        if self._pose_estimation not in [PLANAR_POSE, PNP_POSE]:
+            raise Exception(
+                '\n=====\nUnknown aruco_pose '
+                f'"{self._pose_estimation}". Expected "{PLANAR_POSE}" or '
+                f'"{PNP_POSE}"\n=====\n')
+        # Results of the latest detection for drawing them afterwards
+        self._detections = None
+
+        # Tracking mode
+        image_processing = params["image_processing"]
+        self._tracking = image_processing.get("aruco_tracking", False)
+        self._full_search_interval = image_processing.get(
+            "aruco_full_search_interval", DEFAULT_FULL_SEARCH_INTERVAL)
+        self._reacquire_interval = image_processing.get(
+            "aruco_reacquire_interval", DEFAULT_REACQUIRE_INTERVAL)
+        self._roi_padding = image_processing.get(
+            "aruco_roi_padding", DEFAULT_ROI_PADDING)
+        self._frames_since_full_search = 0
+        # key : aruco_id : int
+        # value : tuple(numpy.array(float32), numpy.array(float32))
+        #     Latest [4, 2] corners of the marker and their movement
+        #     per frame
+        self._tracked_markers = {}
+
+        # Detection from a downscaled image. The corners are refined only
+        # at full resolution.
+        self._downscale = image_processing.get(
+            "aruco_downscale", DEFAULT_DOWNSCALE)
+        self._coarse_detector_parameters = self._create_detector_parameters()
+        self._coarse_detector_parameters.cornerRefinementMethod = \
+            aruco.CORNER_REFINE_NONE
+        # The refinement window has to cover the error of the coarse corners
+        refine_window = max(
+            self._aruco_detector_parameters.cornerRefinementWinSize,
+            2 * self._downscale)
+        self._refine_window = (refine_window, refine_window)
+        self._refine_criteria = (
+            cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_COUNT,
+            self._aruco_detector_parameters.cornerRefinementMaxIterations,
+            self._aruco_detector_parameters.cornerRefinementMinAccuracy)
+
+    @staticmethod
+    def _create_detector_parameters():
+        parameters = aruco.DetectorParameters_create()
+        # More Aruco detection tuning parameters shown at below link.
+        # http://amroamroamro.github.io/mexopencv/opencv_contrib/aruco_detect_markers_demo.html
+        parameters.cornerRefinementMethod = aruco.CORNER_REFINE_SUBPIX
+        parameters.cornerRefinementWinSize = 5
+        parameters.minMarkerDistanceRate = 0.05
+        parameters.cornerRefinementMinAccuracy = 0.5
+        return parameters
+
+    @property
+    def detections(self):
+        """
+        Results of the latest detection. Pass them to draw_detections.
+
+        return : dict or None if nothing has been detected yet
+        """
+        return self._detections
 
     def get_robot_transforms(self, image):
         '''
@@ -65,22 +145,33 @@ class ArucoMarkerDetector():
         '''
         Get the position and rotation for all detected aruco markers.
         '''
-        corners, detected_ids, rejected_img_points = aruco.detectMarkers(
-            image,
-            self._aruco_dict,
-            parameters=self._aruco_detector_parameters)
+        if self._tracking:
+            corners, detected_ids, rejected_img_points = \
+                self._track_markers(image)
+        else:
+            corners, detected_ids, rejected_img_points = \
+                self._detect_markers(image)
+
+        rvecs, tvecs = None, None
+        if self._pose_estimation == PNP_POSE:
+            rvecs, tvecs, _ = aruco.estimatePoseSingleMarkers(
+                corners,
+                self._size_of_marker,
+                self._mtx,
+                self._dist)
 
-        rvecs, tvecs, _ = aruco.estimatePoseSingleMarkers(
-            corners,
-            self._size_of_marker,
-            self._mtx,
-            self._dist)
+        self._detections = {
+            'corners': corners,
+            'detected_ids': detected_ids,
+            'rvecs': rvecs,
+            'tvecs': tvecs,
+            'rejected_img_points': rejected_img_points
+        }
 
-        # Draw detected aruco markers to image
-        if tvecs is not None and rvecs is not None:
-            self._drawDetectedMarkers(
-                image, corners, detected_ids, tvecs,
-                rvecs, rejected_img_points)
+        if self._pose_estimation == PLANAR_POSE:
+            return self._aruco_corners_to_transforms(
+                detected_ids=detected_ids,
+                corners=corners)
 
         transforms = self._aruco_poses_to_transforms(
             detected_ids=detected_ids,
@@ -89,6 +180,222 @@ class ArucoMarkerDetector():
 
         return transforms
 
+    def _detect_markers(self, image):
+        """
+        Detect markers from the full image. With a downscale factor the
+        markers are detected from a downscaled image and only the windows
+        around their corners are processed at full resolution.
+
+        Returns : tuple
+            corners, detected_ids and rejected_img_points in the same
+            format as from aruco.detectMarkers
+        """
+        if self._downscale <= 1:
+            return aruco.detectMarkers(
+                image,
+                self._aruco_dict,
+                parameters=self._aruco_detector_parameters)
+
+        small_image = cv2.resize(
+            image,
+            None,
+            fx=1 / self._downscale,
+            fy=1 / self._downscale,
+            interpolation=cv2.INTER_AREA)
+        corners, detected_ids, rejected_img_points = aruco.detectMarkers(
+            small_image,
+            self._aruco_dict,
+            parameters=self._coarse_detector_parameters)
+
+        # A downscaled pixel's center is in the middle of the pixels it
+        # was made of
+        offset = (self._downscale - 1) / 2
+        corners = [
+            self._refine_corners(image, corner_list * self._downscale + offset)
+            for corner_list in corners]
+        rejected_img_points = [
+            points * self._downscale + offset
+            for points in rejected_img_points]
+        return corners, detected_ids, rejected_img_points
+
+    def _refine_corners(self, image, corner_list):
+        """
+        Refine the corners of a marker to sub-pixel accuracy at full
+        resolution inside a window around the marker
+
+        corner_list : numpy.array(float32) [1, 4, 2]
+
+        return : numpy.array(float32) [1, 4, 2]
+        """
+        height, width = image.shape[:2]
+        margin = self._refine_window[0] + 2
+        x_min, y_min = np.maximum(
+            np.floor(np.min(corner_list[0], axis=0)) - margin,
+            0).astype(int)
+        x_max, y_max = np.minimum(
+            np.ceil(np.max(corner_list[0], axis=0)) + margin + 1,
+            (width, height)).astype(int)
+
+        window = image[y_min:y_max, x_min:x_max]
+        if window.ndim == 3:
+            window = cv2.cvtColor(window, cv2.COLOR_BGR2GRAY)
+        offset = np.array([x_min, y_min], dtype=np.float32)
+        refined = np.reshape(corner_list - offset, (4, 1, 2)).astype(
+            np.float32)
+        cv2.cornerSubPix(
+            window,
+            refined,
+            self._refine_window,
+            (-1, -1),
+            self._refine_criteria)
+        return np.reshape(refined + offset, (1, 4, 2))
+
+    def _track_markers(self, image):
+        """
+        Detect markers only in regions of interest around the predicted
+        positions of the markers found in the previous frame. The full
+        image is searched periodically and at once when a friendly marker
+        found in the previous frame is lost. A friendly marker which is
+        still missing after that, e.g. a robot off the field, is searched
+        from the full image every reacquire_interval frames.
+
+        Returns : tuple
+            corners, detected_ids and rejected_img_points in the same
+            format as from aruco.detectMarkers
+        """
+        friendly_missing = any(
+            aruco_id not in self._tracked_markers
+            for aruco_id in self._friendly_robot_arucos)
+        full_search = (
+            not self._tracked_markers or
+            self._frames_since_full_search >= self._full_search_interval or
+            (friendly_missing and
+             self._frames_since_full_search >= self._reacquire_interval))
+
+        if not full_search:
+            corners, detected_ids, rejected_img_points = \
+                self._detect_markers_in_rois(image)
+            found_ids = [] if detected_ids is None else detected_ids.ravel()
+            # A friendly marker lost since the previous frame is searched
+            # from the full image at once
+            full_search = any(
+                aruco_id in self._tracked_markers and
+                aruco_id not in found_ids
+                for aruco_id in self._friendly_robot_arucos)
+
+        if full_search:
+            corners, detected_ids, rejected_img_points = \
+                self._detect_markers(image)
+            self._frames_since_full_search = 0
+        else:
+            self._frames_since_full_search += 1
+
+        self._update_tracked_markers(corners, detected_ids)
+        return corners, detected_ids, rejected_img_points
+
+    def _detect_markers_in_rois(self, image):
+        """
+        Search every tracked marker inside a padded region around its
+        predicted corners.
+        """
+        height, width = image.shape[:2]
+        all_corners = []
+        all_ids = []
+        rejected_img_points = []
+        for marker_corners, velocity in self._tracked_markers.values():
+            predicted = marker_corners + velocity
+            marker_size = np.max(np.ptp(predicted, axis=0))
+            padding = marker_size * self._roi_padding + np.max(
+                np.abs(velocity))
+            x_min, y_min = np.maximum(
+                np.min(predicted, axis=0) - padding, 0).astype(int)
+            x_max, y_max = np.minimum(
+                np.max(predicted, axis=0) + padding,
+                (width, height)).astype(int)
+            if x_max <= x_min or y_max <= y_min:
+                continue
+
+            # Perimeter rates are relative to the larger side of the image
+            perimeter = np.sum(np.linalg.norm(
+                predicted - np.roll(predicted, 1, axis=0), axis=1))
+            self._roi_detector_parameters.minMarkerPerimeterRate = \
+                MIN_ROI_PERIMETER_RATIO * perimeter / max(
+                    x_max - x_min, y_max - y_min)
+            corners, detected_ids, rejected = aruco.detectMarkers(
+                image[y_min:y_max, x_min:x_max],
+                self._aruco_dict,
+                parameters=self._roi_detector_parameters)
+            offset = np.array([x_min, y_min], dtype=np.float32)
+            rejected_img_points += [points + offset for points in rejected]
+            if detected_ids is None:
+                continue
+            for aruco_id, corner_list in zip(detected_ids, corners):
+                # Regions can overlap so a marker can be found many times
+                if aruco_id[0] in all_ids:
+                    continue
+                all_ids.append(int(aruco_id[0]))
+                all_corners.append(corner_list + offset)
+
+        if not all_ids:
+            return (), None, rejected_img_points
+        detected_ids = np.array(all_ids, dtype=np.int32).reshape((-1, 1))
+        return all_corners, detected_ids, rejected_img_points
+
+    def _update_tracked_markers(self, corners, detected_ids):
+        tracked_markers = {}
+        if detected_ids is not None:
+            for aruco_id, corner_list in zip(detected_ids.ravel(), corners):
+                marker_corners = corner_list[0]
+                velocity = np.zeros_like(marker_corners)
+                if aruco_id in self._tracked_markers:
+                    velocity = \
+                        marker_corners - self._tracked_markers[aruco_id][0]
+                tracked_markers[int(aruco_id)] = (marker_corners, velocity)
+        self._tracked_markers = tracked_markers
+
+    def _aruco_corners_to_transforms(self, detected_ids, corners):
+        """
+        Calculate the positions and headings of all markers at once from
+        their corners. The heading is the direction of the marker's top
+        edge in the image which matches the z rotation of the full pose
+        when the camera looks straight down.
+
+        Args:
+            detected_ids ([int]): Detected aruco marker ids
+            corners (?): List of Detected aruco marker corner's
+                        from aruco.detectMarkers
+
+        Returns : dictionary
+            Same as from _aruco_poses_to_transforms with only_z_rot
+        """
+        if detected_ids is None or len(corners) == 0:
+            return {}
+
+        corners = np.reshape(corners, (-1, 4, 2))
+        centers = np.mean(corners, axis=1, dtype=np.float32)
+        # The heading is measured from the corners in normalized camera
+        # coordinates so lens distortion and non-square pixels don't skew
+        # it. It is the average of the top and bottom edges which both
+        # point along the marker's x axis.
+        undistorted = cv2.undistortPoints(
+            corners.reshape((-1, 1, 2)),
+            self._mtx,
+            self._dist).reshape((-1, 4, 2))
+        x_axes = undistorted[:, 1] - undistorted[:, 0] + \
+            undistorted[:, 2] - undistorted[:, 3]
+        rotations = np.degrees(
+            np.arctan2(x_axes[:, 1], x_axes[:, 0])).astype(np.float64)
+        rotations += ANGLE_CORRECTION_DEGREE
+
+        robot_trans_dict = {}
+        for aruco_id, center, rotation in zip(
+                detected_ids.ravel(), centers, rotations):
+            robot_trans_dict[aruco_id.item()] = {
+                'position': center,
+                'rotation': rotation.reshape((1,))
+            }
+        return robot_trans_dict
+
     def _aruco_poses_to_transforms(
             self,
             detected_ids,
@@ -186,31 +493,34 @@ class ArucoMarkerDetector():
                 math.degrees(z)],
             dtype=np.float32)
 
-    def _drawDetectedMarkers(
-            self,
-            image,
-            corners,
-            detected_ids,
-            tvecs,
-            rvecs,
-            rejected_img_points):
+    def draw_detections(self, image, detections):
         """
         Draw axis to the detected aruco markers
         Draw Squares around detected aruco markers
         Draw the rejected aruco markers candidates
-        """
-        imaxis = aruco.drawDetectedMarkers(image, corners, detected_ids)
-        for i in range(len(tvecs)):
-            imaxis = aruco.drawAxis(
-                imaxis,
-                self._mtx,
-                self._dist,
-                rvecs[i],
-                tvecs[i],
-                self._length_of_axis)
 
-        aruco.drawDetectedMarkers(image, corners, detected_ids)
+        image : numpy.array(uint8)
+            Image to draw to
+        detections : dict
+            Detection results from the detections property
+        """
+        corners = detections['corners']
+        detected_ids = detections['detected_ids']
+        rvecs = detections['rvecs']
+        tvecs = detections['tvecs']
+        if detected_ids is not None:
+            aruco.drawDetectedMarkers(image, corners, detected_ids)
+        # The axes can be drawn only with the PnP pose
+        if tvecs is not None and rvecs is not None:
+            for i in range(len(tvecs)):
+                aruco.drawAxis(
+                    image,
+                    self._mtx,
+                    self._dist,
+                    rvecs[i],
+                    tvecs[i],
+                    self._length_of_axis)
         aruco.drawDetectedMarkers(
             image,
-            rejected_img_points,
+            detections['rejected_img_points'],
             borderColor=BORDER_COLOR)
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class DetectionOverlay():
+    """
+    Draws the detection results over the camera images shown in the game
+    view. The drawing is done in a background thread from the stored
+    detection results so it doesn't slow down the detection nor change
+    the pixels the detectors see. The game view shows the latest finished
+    image, which can be one frame behind the detection.
+    """
+    def __init__(self, aruco_detector):
+        self._aruco_detector = aruco_detector
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='overlay')
+        self._future = None
+        self._image = None
+
+    @property
+    def image(self):
+        """
+        return : numpy.array(uint8)
+            Latest image with the overlays drawn or None if no image
+            has been finished yet
+        """
+        if self._future is not None and self._future.done():
+            self._image = self._future.result()
+            self._future = None
+        return self._image
+
+    def submit(self, image, aruco_detections):
+        """
+        Start drawing the overlays to a copy of the image. The image is
+        skipped if the previous image is still being drawn.
+
+        image : numpy.array(uint8)
+            Camera image the detections were made from
+        aruco_detections : dict
+            Detection results from ArucoMarkerDetector.detections
+        """
+        if self._future is not None and not self._future.done():
+            return
+        if aruco_detections is None:
+            return
+        # The image source may reuse the image's memory after the
+        # detection so it is copied here
+        self._future = self._executor.submit(
+            self._draw, np.copy(image), aruco_detections)
+
+    def clear(self):
+        """
+        Forget the latest image, e.g. when the game view is not shown
+        """
+        self._future = None
+        self._image = None
+
+    def _draw(self, image, aruco_detections):
+        self._aruco_detector.draw_detections(image, aruco_detections)
+        return image
@@ -1,6 +1,5 @@
 import numpy as np
 import cv2
-import imutils
 
 
 ITERATIONS = 2
@@ -34,12 +33,10 @@ class EnergyCoreDetector():
         hsv_image = self._blur_and_hsv(image)
         pos_ecore_coordinates = self._image_to_center_points(
             hsv_image,
-            image,
             self._pos_ecore_low_color,
             self._pos_ecore_high_color)
         neg_ecore_coordinates = self._image_to_center_points(
             hsv_image,
-            image,
             self._neg_ecore_low_color,
             self._neg_ecore_high_color)
 
@@ -48,12 +45,11 @@ class EnergyCoreDetector():
     def _image_to_center_points(
             self,
             hsv_image,
-            orig_image,
             low_color,
             high_color,
             debug_name=False):
-        ecore_image, ecore_mask = self._find_ecores_by_color(
-            hsv_image, orig_image, low_color, high_color)
+        ecore_mask = self._find_ecores_by_color(
+            hsv_image, low_color, high_color)
         ecore_coordinates = self._find_center_points(
             ecore_mask, self._min_ball_area_to_detect)
 
@@ -66,46 +62,45 @@ class EnergyCoreDetector():
     def _find_ecores_by_color(
             self,
             hsv_image,
-            orig_image,
             low_color,
             high_color):
         """
+        Create a mask of the pixels in the color range. Opening the mask
+        erodes and then dilates it ITERATIONS times to remove noise.
         """
         color_mask = cv2.inRange(hsv_image, low_color, high_color)
-        color_mask = cv2.erode(color_mask, None, iterations=ITERATIONS)
-        color_mask = cv2.dilate(color_mask, None, iterations=ITERATIONS)
-        color_image = cv2.bitwise_and(orig_image, orig_image, mask=color_mask)
-        return color_image, color_mask
+        return cv2.morphologyEx(
+            color_mask, cv2.MORPH_OPEN, None, iterations=ITERATIONS)
 
     def _find_center_points(
             self,
             color_mask,
-            min_ball_area_to_detect,
-            orig_image=None):
+            min_ball_area_to_detect):
         """
+        Find the centers of the areas in the mask which are at least
+        min_ball_area_to_detect large.
+
+        return : numpy.array(float32) [N, 2]
+            x and y pixel coordinates of the centers
         """
-        center_points = []
+        # OpenCV 3 returns the image as the first value
         contours = cv2.findContours(
             color_mask, cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE)
-        contours = imutils.grab_contours(contours)
-
-        for contour in contours:
-            # Uncomment the below print to see the right
-            # value for min_ball_area_to_detect
-            # print("Ball area detected: {}".format(cv2.contourArea(contour)))
-            if cv2.contourArea(contour) < min_ball_area_to_detect:
-                continue
-
-            if orig_image is not None:
-                cv2.drawContours(orig_image, contour, -1, GREEN, 3)
-            # compute the center of the contour
-            moments = cv2.moments(contour)
-            center_x = int(moments["m10"] / moments["m00"])
-            center_y = int(moments["m01"] / moments["m00"])
-            center_points.append([center_x, center_y])
-
-        return center_points
+            cv2.CHAIN_APPROX_SIMPLE)[-2]
+        moments = np.array(
+            [
+                (moments["m00"], moments["m10"], moments["m01"])
+                for moments in map(cv2.moments, contours)
+            ],
+            dtype=np.float64).reshape((-1, 3))
+
+        # Uncomment the below print to see the right
+        # value for min_ball_area_to_detect
+        # print(f"Ball areas detected: {moments[:, 0]}")
+        areas = moments[:, 0]
+        large_enough = (areas >= min_ball_area_to_detect) & (areas > 0)
+        moments = moments[large_enough]
+        return (moments[:, 1:] / moments[:, :1]).astype(np.float32)
 
     def _blur_and_hsv(self, image):
         blurred_frame = cv2.GaussianBlur(image, (5, 5), 0)
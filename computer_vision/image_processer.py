@@ -1,17 +1,53 @@
 from computer_vision.aruco_marker_detector import ArucoMarkerDetector
 from computer_vision.ecore_detector import EnergyCoreDetector
+from computer_vision.detection_overlay import DetectionOverlay
+from computer_vision.rectifier import Rectifier, RECTIFY_POINTS
+from computer_vision.transform_tracker import TransformTracker
+from computer_vision.latency_compensator import LatencyCompensator
 from observation_maker.observation_maker import ObservationMaker
+from concurrent.futures import ThreadPoolExecutor
 
+import os
+import time
 import cv2
 import numpy as np
 
 
+DEFAULT_DETECTION_WORKERS = 2
+
+
 class ImageProcesser():
     def __init__(self, params):
         self._params = params
         self._aruco_detector = ArucoMarkerDetector(params)
         self._ecore_detector = EnergyCoreDetector(params)
         self._observation_maker = ObservationMaker(params)
+        self._overlay = DetectionOverlay(self._aruco_detector)
+        self._rectifier = Rectifier(params)
+        # Smooths the detections and bridges short detection dropouts
+        self._tracker = None
+        if params["image_processing"].get("object_tracking", False):
+            self._tracker = TransformTracker(params)
+        # Moves the friendly robots to where they are when the actions
+        # reach them
+        self._compensator = None
+        if params["image_processing"].get("latency_compensation", False):
+            self._compensator = LatencyCompensator(params)
+
+        # The detections release the GIL so they run in parallel threads.
+        # With zero workers they run one after another in the calling thread.
+        self._detection_cpus = \
+            params["image_processing"].get("detection_cpu_affinity", [])
+        detection_workers = params["image_processing"].get(
+            "detection_workers", DEFAULT_DETECTION_WORKERS)
+        self._detection_pool = None
+        if detection_workers > 0:
+            self._detection_pool = ThreadPoolExecutor(
+                max_workers=detection_workers,
+                thread_name_prefix='detection',
+                initializer=self._set_detection_affinity)
+        self._aruco_detection_time = 0.0
+        self._ecore_detection_time = 0.0
 
     @property
     def angles(self):
@@ -21,17 +57,75 @@ class ImageProcesser():
         """
         return self._observation_maker.angles
 
+    @property
+    def step_time(self):
+        """
+        return : float
+            Duration of the latest observation step in seconds
+        """
+        return self._observation_maker.step_time
+
+    @property
+    def aruco_detection_time(self):
+        """
+        return : float
+            Duration of the latest aruco marker detection in seconds
+        """
+        return self._aruco_detection_time
+
+    @property
+    def ecore_detection_time(self):
+        """
+        return : float
+            Duration of the latest energy core detection in seconds
+        """
+        return self._ecore_detection_time
+
+    @property
+    def rendering(self):
+        return self._observation_maker.rendering
+
+    def set_rendering(self, rendering):
+        """
+        Enable or disable rendering the game view when making observations
+        """
+        self._observation_maker.set_rendering(rendering)
+        if not rendering:
+            self._overlay.clear()
+
+    def actions_sent(self, actions, sent_time, capture_time=None):
+        """
+        Tell the latency compensation which actions were sent to the
+        robots
+
+        actions : dict
+            key : aruco_id : int
+            value : action : int
+        sent_time : float
+            Time the actions were sent in seconds
+        capture_time : float
+            Capture time of the image the actions were made from or None
+        """
+        if self._compensator is not None:
+            self._compensator.add_actions(actions, sent_time, capture_time)
+
     def get_image(self):
         image = self._observation_maker.get_image()
         return image
 
-    def image_to_observations(self, image):
+    def image_to_observations(self, image, capture_time=None):
         """
         Create observations for the neural network from input image.
+
+        image : numpy.array(uint8)
+        capture_time : float
+            Time the image was captured in seconds. Used by the object
+            tracking and the latency compensation, the current time if None.
         """
         if image is None:
             raise 'No image given to "image_to_observations"-method'
         warning_text = ''
+        image = self._rectifier.rectify_image(image)
 
         # Mask goal area to stop robot from moving when ball is in goal
         # pts = np.array(self._params['arena']['enemy_goal'])
@@ -39,31 +133,122 @@ class ImageProcesser():
         # pts = np.array(self._params['arena']['friendly_goal'])
         # cv2.fillPoly(image, [pts], (255, 0, 0))
 
-        # 1) Detect aruco markers for own and enemy robots
-        friendly_trans_dict, enemy_trans_dict = \
-            self._aruco_detector.get_robot_transforms(image=image)
-
+        # 1) Detect aruco markers for own and enemy robots and
         # 2) Detect good and bad balls
-        pos_ecore_transforms, neg_ecore_transforms = \
-            self._ecore_detector.get_ecore_transforms(image=image)
+        if self._detection_pool is None:
+            aruco_result = self._timed(
+                self._aruco_detector.get_robot_transforms, image)
+            ecore_result = self._timed(
+                self._ecore_detector.get_ecore_transforms, image)
+        else:
+            aruco_future = self._detection_pool.submit(
+                self._timed,
+                self._aruco_detector.get_robot_transforms,
+                image)
+            ecore_future = self._detection_pool.submit(
+                self._timed,
+                self._ecore_detector.get_ecore_transforms,
+                image)
+            aruco_result = aruco_future.result()
+            ecore_result = ecore_future.result()
+        (friendly_trans_dict, enemy_trans_dict), \
+            self._aruco_detection_time = aruco_result
+        (pos_ecore_transforms, neg_ecore_transforms), \
+            self._ecore_detection_time = ecore_result
+        if self._rectifier.mode == RECTIFY_POINTS:
+            pos_ecore_transforms, neg_ecore_transforms = \
+                self._rectify_positions(
+                    [friendly_trans_dict, enemy_trans_dict],
+                    [pos_ecore_transforms, neg_ecore_transforms])
+        if capture_time is None:
+            capture_time = time.time()
+        if self._tracker is not None:
+            friendly_trans_dict, enemy_trans_dict = \
+                self._tracker.update_robots(
+                    [friendly_trans_dict, enemy_trans_dict], capture_time)
+            pos_ecore_transforms, neg_ecore_transforms = \
+                self._tracker.update_ecores(
+                    [pos_ecore_transforms, neg_ecore_transforms],
+                    capture_time)
+        if self._compensator is not None:
+            self._compensator.compensate(friendly_trans_dict, capture_time)
+
+        # The game view shows the detections drawn over the image
+        background = image
+        if self.rendering:
+            self._overlay.submit(image, self._aruco_detector.detections)
+            if self._overlay.image is not None:
+                background = self._overlay.image
 
         # 3.1) No friendly robots or no balls detected
-        if ((not pos_ecore_transforms and not neg_ecore_transforms) or not
-           friendly_trans_dict):
+        no_ecores = \
+            len(pos_ecore_transforms) == 0 and len(neg_ecore_transforms) == 0
+        if no_ecores or not friendly_trans_dict:
             if not friendly_trans_dict:
                 warning_text = \
                     "Could not locate friendly robot Aruco markers\n"
-            if not pos_ecore_transforms and not neg_ecore_transforms:
+            if no_ecores:
                 warning_text = warning_text + 'Could not locate balls'
-            self._observation_maker.update_image(image, message=warning_text)
+            self._observation_maker.update_image(
+                background, message=warning_text)
             return {}
 
         # 3.2) Get observations for friendly robots
         robot_observations_dict = self._observation_maker.get_observations(
-            image=image,
+            image=background,
             friendly_trans_dict=friendly_trans_dict,
             pos_ecore_transforms=pos_ecore_transforms,
             neg_ecore_transforms=neg_ecore_transforms,
             enemy_trans_dict=enemy_trans_dict)
 
         return robot_observations_dict
+
+    def _rectify_positions(self, robot_trans_dicts, ecore_transforms):
+        """
+        Undistort all the detected positions with a single call. The robot
+        positions are changed in place.
+
+        robot_trans_dicts : list(dict)
+            Robot transforms from ArucoMarkerDetector
+        ecore_transforms : list(numpy.array(float32) [N, 2])
+            Energy core positions from EnergyCoreDetector
+
+        return : list(numpy.array(float32) [N, 2])
+            Undistorted energy core positions
+        """
+        robot_transforms = [
+            transform
+            for trans_dict in robot_trans_dicts
+            for transform in trans_dict.values()]
+        points = [
+            np.reshape(transform['position'], (1, 2))
+            for transform in robot_transforms]
+        points += [np.reshape(ecores, (-1, 2)) for ecores in ecore_transforms]
+        points = self._rectifier.rectify_points(
+            np.concatenate(points).astype(np.float32))
+
+        for index, transform in enumerate(robot_transforms):
+            transform['position'] = points[index]
+        start = len(robot_transforms)
+        rectified_ecores = []
+        for ecores in ecore_transforms:
+            rectified_ecores.append(points[start:start + len(ecores)])
+            start += len(ecores)
+        return rectified_ecores
+
+    @staticmethod
+    def _timed(detect, image):
+        """
+        Run a detection and measure its duration
+
+        return : tuple(detection result, float)
+        """
+        start_time = time.time()
+        result = detect(image=image)
+        return result, time.time() - start_time
+
+    def _set_detection_affinity(self):
+        # Called in every detection thread. On Linux the pid 0 sets the
+        # affinity of the calling thread only.
+        if self._detection_cpus and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, self._detection_cpus)
@@ -0,0 +1,203 @@
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+from ai_robot.ai_robot import get_motor_speeds
+from ai_robot.actuation_scheduler import DEFAULT_MAX_KEEPALIVE_TIME
+
+
+# Robot's forward speed in pixels per second for one motor speed unit and
+# turning rate in degrees per second for one unit of motor speed difference
+DEFAULT_MOTOR_SPEED_TO_PIXELS = 5.0
+DEFAULT_MOTOR_SPEED_TO_DEGREES = 2.0
+# Seconds from sending an action until the motors react
+DEFAULT_ACTUATION_DELAY = 0.05
+# Weight of the newest measurement in the smoothed pipeline latency
+LATENCY_SMOOTHING = 0.2
+# Number of sent commands kept for every robot
+COMMAND_HISTORY = 16
+
+
+class LatencyCompensator():
+    """
+    Predicts where the friendly robots are when the actions made from an
+    image reach their motors. The detected poses are moved forward with
+    the motor speeds of the actions sent after the image was captured.
+
+    The time from capturing an image to sending its actions is measured
+    from the sent actions and smoothed. The actuation delay is added on
+    top of it. Only the robots which have robot_speed, turn_speed and
+    move_turn_speed in the ai_robots params are compensated.
+    """
+    def __init__(self, params):
+        image_processing = params["image_processing"]
+        self._speed_to_pixels = image_processing.get(
+            "motor_speed_to_pixels", DEFAULT_MOTOR_SPEED_TO_PIXELS)
+        self._speed_to_degrees = image_processing.get(
+            "motor_speed_to_degrees", DEFAULT_MOTOR_SPEED_TO_DEGREES)
+        self._actuation_delay = image_processing.get(
+            "actuation_delay", DEFAULT_ACTUATION_DELAY)
+
+        # key : aruco_id : int
+        # value : tuple(number, number, number) : robot_speed, turn_speed
+        #   and move_turn_speed
+        self._robot_speeds = {}
+        # With keepalive the action is sent again until max_keepalive_time
+        # after the decision, so the robot runs it that long instead of
+        # its action timeout
+        keepalive_time = None
+        if params["ai_robots"].get("keepalive", False):
+            keepalive_time = params["ai_robots"].get(
+                "max_keepalive_time", DEFAULT_MAX_KEEPALIVE_TIME) / 1000
+
+        # key : aruco_id : int
+        # value : float : seconds the robot runs an action. None if the
+        #   robot runs it until the next action.
+        self._action_timeouts = {}
+        for robot in params["ai_robots"]["robots"]:
+            speeds = [
+                robot.get(name)
+                for name in ["robot_speed", "turn_speed", "move_turn_speed"]]
+            if None in speeds:
+                continue
+            aruco_id = int(robot["aruco_code"])
+            self._robot_speeds[aruco_id] = tuple(speeds)
+            if keepalive_time is not None:
+                self._action_timeouts[aruco_id] = keepalive_time
+            elif "action_timeout" in robot:
+                self._action_timeouts[aruco_id] = \
+                    robot["action_timeout"] / 1000
+            else:
+                self._action_timeouts[aruco_id] = None
+
+        # key : aruco_id : int
+        # value : deque(tuple(float, float, float)) : time the motors
+        #   reacted, left and right motor speed
+        self._commands = {
+            aruco_id: deque(maxlen=COMMAND_HISTORY)
+            for aruco_id in self._robot_speeds}
+        self._latency = None
+        self._lock = threading.Lock()
+
+    @property
+    def latency(self):
+        """
+        return : float
+            Smoothed time from capturing an image to sending its actions
+            in seconds or None if no actions have been sent yet
+        """
+        return self._latency
+
+    def add_actions(self, actions, sent_time, capture_time=None):
+        """
+        Store the actions sent to the robots
+
+        actions : dict
+            key : aruco_id : int
+            value : action : int
+        sent_time : float
+            Time the actions were sent in seconds
+        capture_time : float
+            Capture time of the image the actions were made from. None if
+            the actions were not made from an image, e.g. stop commands.
+        """
+        reaction_time = sent_time + self._actuation_delay
+        with self._lock:
+            for aruco_id, action in actions.items():
+                if aruco_id not in self._robot_speeds:
+                    continue
+                l_motor, r_motor = get_motor_speeds(
+                    action, *self._robot_speeds[aruco_id])
+                self._commands[aruco_id].append(
+                    (reaction_time, l_motor, r_motor))
+            if capture_time is not None:
+                latency = sent_time - capture_time
+                if self._latency is None:
+                    self._latency = latency
+                else:
+                    self._latency += LATENCY_SMOOTHING * \
+                        (latency - self._latency)
+
+    def compensate(self, friendly_trans_dict, capture_time):
+        """
+        Move the friendly robots to their predicted poses at the time the
+        actions made from this image reach the motors. The transforms are
+        changed in place.
+
+        friendly_trans_dict : dict
+            Friendly robot transforms from ArucoMarkerDetector
+        capture_time : float
+            Capture time of the image in seconds
+        """
+        if self._latency is None:
+            return
+        action_time = capture_time + self._latency + self._actuation_delay
+        with self._lock:
+            commands = {
+                aruco_id: list(self._commands[aruco_id])
+                for aruco_id in friendly_trans_dict
+                if aruco_id in self._commands}
+
+        for aruco_id, robot_commands in commands.items():
+            transform = friendly_trans_dict[aruco_id]
+            position = np.array(transform['position'], dtype=np.float64)
+            rotation = float(transform['rotation'][0])
+            for l_motor, r_motor, start, end in self._command_segments(
+                    robot_commands,
+                    self._action_timeouts[aruco_id],
+                    capture_time,
+                    action_time):
+                position, rotation = self._move(
+                    position, rotation, l_motor, r_motor, end - start)
+            transform['position'] = position.astype(np.float32)
+            transform['rotation'] = np.array(transform['rotation'])
+            transform['rotation'][0] = (rotation + 180.0) % 360.0 - 180.0
+
+    @staticmethod
+    def _command_segments(commands, action_timeout, start_time, end_time):
+        """
+        Split the time between start_time and end_time to the parts in
+        which a single command was running
+
+        return : list(tuple(number, number, float, float))
+            Left and right motor speed, start and end time of every part
+        """
+        segments = []
+        for index, (reaction_time, l_motor, r_motor) in enumerate(commands):
+            command_end = end_time
+            if index + 1 < len(commands):
+                command_end = min(command_end, commands[index + 1][0])
+            if action_timeout is not None:
+                command_end = min(command_end, reaction_time + action_timeout)
+            command_start = max(start_time, reaction_time)
+            if command_end > command_start:
+                segments.append((l_motor, r_motor, command_start, command_end))
+        return segments
+
+    def _move(self, position, rotation, l_motor, r_motor, duration):
+        """
+        Move a differential drive robot with constant motor speeds. The
+        robot's front is towards the top of the image at zero rotation
+        and a positive turning rate turns it clockwise in the image.
+
+        position : numpy.array(float64) [x, y] in pixels
+        rotation : float in degrees
+
+        return : tuple(numpy.array(float64), float)
+            New position and rotation
+        """
+        speed = self._speed_to_pixels * (l_motor + r_motor) / 2
+        turn_rate = math.radians(self._speed_to_degrees * (l_motor - r_motor))
+        start_angle = math.radians(rotation)
+        end_angle = start_angle + turn_rate * duration
+        if abs(turn_rate) < 1e-6:
+            offset = speed * duration * np.array(
+                [math.sin(start_angle), -math.cos(start_angle)])
+        else:
+            # Integral of the front direction over the arc
+            offset = speed / turn_rate * np.array([
+                math.cos(start_angle) - math.cos(end_angle),
+                math.sin(start_angle) - math.sin(end_angle)])
+        return position + offset, math.degrees(end_angle)
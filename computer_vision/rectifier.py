@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import numpy as np
+import cv2
+
+
+NO_RECTIFICATION = "none"
+RECTIFY_POINTS = "points"
+RECTIFY_IMAGE = "image"
+RECTIFICATION_MODES = [NO_RECTIFICATION, RECTIFY_POINTS, RECTIFY_IMAGE]
+
+
+def get_calibration_file(params):
+    if 'simulation' in params:
+        return params["simulation"]["calib_params"]
+    elif 'ai_video_streamer' in params:
+        return params["ai_video_streamer"]["calib_params"]
+
+
+def get_capture_size(params):
+    """
+    return : tuple(int, int) or None
+        Width and height of the captured images
+    """
+    for group in ['simulation', 'ai_video_streamer']:
+        if group in params:
+            return (
+                params[group]["capture_width"],
+                params[group]["capture_height"])
+    return None
+
+
+class Rectifier():
+    """
+    Removes the lens distortion from the camera images or from the
+    detected points using the camera calibration.
+
+    In "image" mode every image is remapped with maps which are computed
+    once and cached on disk next to the calibration file. The cache file
+    name has the calibration file's hash so a new calibration creates new
+    maps. In "points" mode only the detected points are undistorted which
+    is much cheaper. In "none" mode nothing is done.
+    """
+    def __init__(self, params):
+        self._mode = params["image_processing"].get(
+            "rectification", NO_RECTIFICATION).lower()
+        if self._mode not in RECTIFICATION_MODES:
+            raise Exception(
+                '\n=====\nUnknown rectification mode '
+                f'"{self._mode}". Expected one of {RECTIFICATION_MODES}'
+                '\n=====\n')
+
+        self._calib_file = get_calibration_file(params)
+        with open(self._calib_file, 'rb') as calib_file:
+            calib_file_content = calib_file.read()
+        self._calib_hash = hashlib.sha1(calib_file_content).hexdigest()[:16]
+        camera_calib_params = json.loads(calib_file_content)
+        self._mtx = np.array(camera_calib_params["mtx"], dtype=np.float32)
+        self._dist = np.array(camera_calib_params["dist"], dtype=np.float32)
+
+        # key : tuple(int, int) : image width and height
+        # value : tuple(numpy.array, numpy.array) : remap maps
+        self._maps = {}
+        capture_size = get_capture_size(params)
+        if self._mode == RECTIFY_IMAGE and capture_size is not None:
+            self._get_maps(capture_size)
+
+    @property
+    def mode(self):
+        return self._mode
+
+    def rectify_image(self, image):
+        """
+        return : numpy.array(uint8)
+            Undistorted image in "image" mode otherwise the given image
+        """
+        if self._mode != RECTIFY_IMAGE:
+            return image
+        height, width = image.shape[:2]
+        map1, map2 = self._get_maps((width, height))
+        return cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
+
+    def rectify_points(self, points):
+        """
+        points : numpy.array(float32) [N, 2]
+            Pixel coordinates in the distorted image
+
+        return : numpy.array(float32) [N, 2]
+            Undistorted pixel coordinates in "points" mode otherwise the
+            given points
+        """
+        if self._mode != RECTIFY_POINTS or len(points) == 0:
+            return points
+        undistorted = cv2.undistortPoints(
+            np.asarray(points, dtype=np.float32).reshape((-1, 1, 2)),
+            self._mtx,
+            self._dist,
+            P=self._mtx)
+        return undistorted.reshape((-1, 2))
+
+    def _get_maps(self, size):
+        if size in self._maps:
+            return self._maps[size]
+
+        width, height = size
+        cache_file = os.path.splitext(self._calib_file)[0] + \
+            f'-rectify-maps-{self._calib_hash}-{width}x{height}.npz'
+        if os.path.exists(cache_file):
+            maps = np.load(cache_file)
+            self._maps[size] = (maps['map1'], maps['map2'])
+        else:
+            print(f'Creating rectification maps to "{cache_file}"')
+            self._maps[size] = cv2.initUndistortRectifyMap(
+                self._mtx, self._dist, None, self._mtx, size, cv2.CV_16SC2)
+            np.savez(
+                cache_file,
+                map1=self._maps[size][0],
+                map2=self._maps[size][1])
+        return self._maps[size]
@@ -0,0 +1,222 @@
+import numpy as np
+
+
+# Alpha-beta filter gains. Alpha is how much of the position error is
+# corrected each frame and beta how much of it is turned into velocity.
+DEFAULT_ALPHA = 0.7
+DEFAULT_BETA = 0.3
+# Seconds a lost object is predicted forward before it is dropped
+DEFAULT_MAX_DROPOUT = 0.3
+# Energy core detections further than this from a track, in pixels, start
+# a new track
+DEFAULT_ECORE_ASSOCIATION_DISTANCE = 40
+
+
+class AlphaBetaTrack():
+    """
+    Constant velocity alpha-beta filter for a single object. The state
+    can have any number of values. The values listed in wrapped_values
+    are angles in degrees which wrap around at +-180.
+    """
+    def __init__(self, values, timestamp, alpha, beta, wrapped_values=()):
+        self.values = np.asarray(values, dtype=np.float64).copy()
+        self.velocity = np.zeros_like(self.values)
+        self.last_seen = timestamp
+        self._timestamp = timestamp
+        self._alpha = alpha
+        self._beta = beta
+        self._wrapped = np.zeros(self.values.shape, dtype=bool)
+        self._wrapped[list(wrapped_values)] = True
+
+    def predict(self, timestamp):
+        """
+        return : numpy.array(float64)
+            Values extrapolated to the given time
+        """
+        return self._wrap(
+            self.values + self.velocity * (timestamp - self._timestamp))
+
+    def update(self, values, timestamp):
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            # Same or older frame, take the measurement as is
+            self.values = np.asarray(values, dtype=np.float64).copy()
+            self.last_seen = max(self.last_seen, timestamp)
+            return
+        predicted = self.predict(timestamp)
+        residual = self._wrap(np.asarray(values) - predicted)
+        self.values = self._wrap(predicted + self._alpha * residual)
+        self.velocity = self.velocity + self._beta * residual / dt
+        self._timestamp = timestamp
+        self.last_seen = timestamp
+
+    def _wrap(self, values):
+        values[self._wrapped] = \
+            (values[self._wrapped] + 180.0) % 360.0 - 180.0
+        return values
+
+
+class TransformTracker():
+    """
+    Smooths the detected robot and energy core positions and bridges
+    short detection dropouts. Every object has its own alpha-beta filter.
+    Robots are associated by their aruco id and energy cores by the
+    nearest track. A lost object is predicted forward with its latest
+    velocity for max_dropout seconds before it is dropped.
+
+    The returned transforms can be extrapolated lead_time seconds past
+    the capture time, e.g. to the time the robots act on the commands.
+    """
+    def __init__(self, params):
+        image_processing = params["image_processing"]
+        self._alpha = image_processing.get(
+            "object_tracking_alpha", DEFAULT_ALPHA)
+        self._beta = image_processing.get(
+            "object_tracking_beta", DEFAULT_BETA)
+        self._max_dropout = image_processing.get(
+            "object_tracking_max_dropout", DEFAULT_MAX_DROPOUT)
+        self._lead_time = image_processing.get(
+            "object_tracking_lead_time", 0.0)
+        self._ecore_association_distance = image_processing.get(
+            "ecore_association_distance",
+            DEFAULT_ECORE_ASSOCIATION_DISTANCE)
+
+        # key : aruco_id : int
+        # value : AlphaBetaTrack : position x, y and rotations
+        self._robot_tracks = {}
+        # key : aruco_id : int
+        # value : int : index of the dictionary the robot was detected in
+        self._robot_groups = {}
+        # One list of AlphaBetaTracks for positive and one for negative
+        # energy cores
+        self._ecore_tracks = [[], []]
+
+    def reset(self):
+        self._robot_tracks = {}
+        self._robot_groups = {}
+        self._ecore_tracks = [[], []]
+
+    def update_robots(self, robot_trans_dicts, timestamp):
+        """
+        Filter the detected robot transforms
+
+        robot_trans_dicts : list(dict)
+            Robot transforms from ArucoMarkerDetector, e.g. the friendly
+            and enemy robots
+        timestamp : float
+            Capture time of the image in seconds
+
+        return : list(dict)
+            Filtered robot transforms in the same format. Robots lost
+            for less than max_dropout seconds are included with their
+            predicted transforms.
+        """
+        prediction_time = timestamp + self._lead_time
+        filtered_dicts = []
+        for index, trans_dict in enumerate(robot_trans_dicts):
+            filtered_dict = {}
+            for aruco_id, transform in trans_dict.items():
+                values = np.concatenate(
+                    (transform['position'], transform['rotation']))
+                track = self._robot_tracks.get(aruco_id)
+                if track is None:
+                    track = AlphaBetaTrack(
+                        values,
+                        timestamp,
+                        self._alpha,
+                        self._beta,
+                        wrapped_values=range(2, len(values)))
+                    self._robot_tracks[aruco_id] = track
+                else:
+                    track.update(values, timestamp)
+                self._robot_groups[aruco_id] = index
+                filtered_dict[aruco_id] = self._to_transform(
+                    track.predict(prediction_time))
+            filtered_dicts.append(filtered_dict)
+
+        # Add the lost robots to the dictionary they were last seen in
+        for aruco_id, track in list(self._robot_tracks.items()):
+            index = self._robot_groups[aruco_id]
+            if aruco_id in robot_trans_dicts[index]:
+                continue
+            if timestamp - track.last_seen > self._max_dropout:
+                del self._robot_tracks[aruco_id]
+                del self._robot_groups[aruco_id]
+                continue
+            filtered_dicts[index][aruco_id] = self._to_transform(
+                track.predict(prediction_time))
+        return filtered_dicts
+
+    def update_ecores(self, ecore_transforms, timestamp):
+        """
+        Filter the detected energy core positions
+
+        ecore_transforms : list(numpy.array(float32) [N, 2])
+            Positive and negative energy core positions from
+            EnergyCoreDetector
+        timestamp : float
+            Capture time of the image in seconds
+
+        return : list(numpy.array(float32) [N, 2])
+            Filtered positions including the cores lost for less than
+            max_dropout seconds
+        """
+        prediction_time = timestamp + self._lead_time
+        filtered_ecores = []
+        for index, positions in enumerate(ecore_transforms):
+            tracks = self._associate_ecores(
+                self._ecore_tracks[index],
+                np.reshape(positions, (-1, 2)),
+                timestamp)
+            self._ecore_tracks[index] = tracks
+            filtered = np.empty((len(tracks), 2), dtype=np.float32)
+            for track_index, track in enumerate(tracks):
+                filtered[track_index] = track.predict(prediction_time)
+            filtered_ecores.append(filtered)
+        return filtered_ecores
+
+    def _associate_ecores(self, tracks, positions, timestamp):
+        """
+        Update the tracks with the nearest detections. The closest
+        track and detection pairs are matched first.
+
+        return : list(AlphaBetaTrack)
+            Tracks which are still alive
+        """
+        matched_tracks = set()
+        matched_positions = set()
+        if tracks and len(positions):
+            predicted = np.array(
+                [track.predict(timestamp) for track in tracks])
+            distances = np.linalg.norm(
+                predicted[:, None] - positions[None], axis=2)
+            for flat_index in np.argsort(distances, axis=None):
+                track_index, position_index = np.unravel_index(
+                    flat_index, distances.shape)
+                if distances[track_index, position_index] > \
+                        self._ecore_association_distance:
+                    break
+                if track_index in matched_tracks or \
+                        position_index in matched_positions:
+                    continue
+                tracks[track_index].update(
+                    positions[position_index], timestamp)
+                matched_tracks.add(track_index)
+                matched_positions.add(position_index)
+
+        alive_tracks = [
+            track for index, track in enumerate(tracks)
+            if index in matched_tracks or
+            timestamp - track.last_seen <= self._max_dropout]
+        for index, position in enumerate(positions):
+            if index not in matched_positions:
+                alive_tracks.append(AlphaBetaTrack(
+                    position, timestamp, self._alpha, self._beta))
+        return alive_tracks
+
+    @staticmethod
+    def _to_transform(values):
+        return {
+            'position': values[:2].astype(np.float32),
+            'rotation': values[2:]
+        }
@@ -1,5 +1,6 @@
 from concurrent import futures
 import traceback
+import threading
 import cv2
 import time
 from multiprocessing import Process, Array
@@ -9,13 +10,23 @@ import numpy as np
 from utils.utils import parse_options
 from utils.constants import SIMU, TEST, PROD
 from ai_simulator.ai_simulator import UnitySimulation
-from ai_remote_brain.ai_remote_brain import UnityBrainServer
+from ai_remote_brain.ai_remote_brain import make_brain_server
 from ai_robot.ai_robots_handler import AIRobotsHandler
 from reallife_camera_source.gstreamer_video_sink import GStreamerVideoSink
 from computer_vision.image_processer import ImageProcesser
+from game.pipeline import DropOldestQueue
 
 
 IMAGE_CHANNELS = 3
+# In headless mode the game view is rendered only if a viewer has asked
+# for a frame within this many seconds
+VIEWER_TIMEOUT = 1.0
+SEQUENTIAL_GAME_LOOP = "sequential"
+PIPELINED_GAME_LOOP = "pipelined"
+# How often, in seconds, the pipeline stages check if the game has stopped
+PIPELINE_POLL_TIME = 0.1
+# How long, in seconds, to wait for a new frame before reporting no image
+FRAME_TIMEOUT = 0.1
 
 
 class Game:
@@ -51,18 +62,28 @@ class Game:
             arr_size = width * height * 3
 
             self._step_time = 1 / params['decision_rate']
+            self._headless = params['image_processing'].get('headless', False)
+            game_loop = params.get('game_loop', SEQUENTIAL_GAME_LOOP).lower()
+            if game_loop not in (SEQUENTIAL_GAME_LOOP, PIPELINED_GAME_LOOP):
+                raise Exception(
+                    f'\n===\nUnidentified game loop: {game_loop}\n===\n')
             self._image_source, self._frontend = \
                 self._get_image_source_and_frontend(mode, params)
 
             self._image_processer = ImageProcesser(params)
+            self._brain_server = None
             if mode == PROD or mode == SIMU:
-                brain_server = UnityBrainServer(params)
+                self._brain_server = make_brain_server(params)
 
             shared_image = np.frombuffer(
                 shared_array.get_obj(),
                 dtype=np.uint8)
             self._shared_image = np.reshape(shared_image, image_size)
 
+            if game_loop == PIPELINED_GAME_LOOP:
+                self._run_pipelined_loop(shared_state)
+                return
+
             while True:
                 self._log_time(log_start=True)
                 with shared_state.get_lock():
@@ -70,28 +91,35 @@ class Game:
                         break
 
                 # 1) Get image
-                if self._image_source.frame_available() is None:
-                    print("==== IMAGE IS NONE")
-                if not self._image_source.frame_available():
+                if not self._image_source.wait_for_new_frame(
+                        timeout=FRAME_TIMEOUT):
                     self._shared_data['status'] = 'No image'
                     print("\n\n=========== No image\n\n")
-                    time.sleep(0.1)
                     continue
-                image = self._image_source.frame()
+                image, frame_token = self._image_source.acquire_frame()
+                capture_time = self._image_source.frame_timestamp
                 self._log_time(log_name='imageCaptureDuration')
 
+                self._image_processer.set_rendering(self._rendering_needed())
+
                 # 2) Get observations from image
                 # The _ and __ variables are placeholders for the second
                 # robot and it's observations
                 robot_observations_dict = \
-                    self._image_processer.image_to_observations(image=image)
+                    self._image_processer.image_to_observations(
+                        image=image, capture_time=capture_time)
+                self._image_source.release_frame(frame_token)
                 self._log_time(log_name='obsCreationDuration')
+                self._log_image_processing_times()
 
                 # 2.1) We didn't get observations
                 if not robot_observations_dict:
                     self._shared_data['status'] = 'No observations'
                     # print("\n\n=========== No observations\n\n")
                     self._stop_robots()
+                    self._image_processer.actions_sent(
+                        {aruco: 0 for aruco in self._robot_arucos},
+                        time.time())
                     self._end_routine()
                     continue
                 # 2.2) We got observations
@@ -104,14 +132,22 @@ class Game:
 
                 if mode == PROD or mode == SIMU:
                     # 3a) Get action from brain with the observations
-                    actions = brain_server.get_actions(robot_observations_dict)
+                    actions = self._brain_server.get_actions(
+                        robot_observations_dict)
                     self._log_time(log_name='brainDuration')
+                    self._log_brain_responses()
 
                     print(f"Got actions: {actions}")
                     # 4) Send the action to frontend
                     actions = dict(filter(lambda act: act[0] in self._robot_arucos, actions.items()))
                     print(f"Got filtered: {actions}")
                     _ = self._frontend.make_actions(actions)
+                    sent_time = time.time()
+                    self._log_send_latencies()
+                    self._image_processer.actions_sent(
+                        actions, sent_time, capture_time)
+                    self._shared_data['photonToMotorAge'] = \
+                        sent_time - capture_time
                     self._shared_data['status'] = 'Playing game'
                     self._log_time(log_name='frontendDuration')
                 else:
@@ -132,19 +168,243 @@ class Game:
                   f'Game-class. Message: {error}\n=====\n')
 
         finally:
-            self._stop_robots()
+            try:
+                self._stop_robots()
+            finally:
+                self._close_connections()
             self._image_source.stop()
             print("Game: Game stopped")
 
+    def _run_pipelined_loop(self, shared_state):
+        """
+        Run the game as a pipeline. Image capture, brain and frontend
+        stages run in their own threads and the observations are created
+        in this thread, so frame N+1 is processed while frame N is at the
+        brain and the actions of frame N-1 are sent to the robots. The
+        stages are connected with queues which drop the oldest item so
+        the latency can't grow.
+
+        shared_state : multiprocessing.Value(c_bool)
+            The game stops when the value is set to False
+
+        return : Doesn't return anything
+        """
+        self._frame_queue = DropOldestQueue(on_drop=self._release_frame)
+        self._observation_queue = DropOldestQueue()
+        self._action_queue = DropOldestQueue()
+        self._pipeline_stop = threading.Event()
+        self._pipeline_error = threading.Event()
+
+        stages = [self._capture_stage]
+        if self._mode == PROD or self._mode == SIMU:
+            stages += [self._brain_stage, self._frontend_stage]
+        threads = [
+            threading.Thread(target=self._run_stage, args=(stage,))
+            for stage in stages]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while not self._pipeline_error.is_set():
+                with shared_state.get_lock():
+                    if shared_state.value is False:
+                        break
+                frame_item = self._frame_queue.get(timeout=PIPELINE_POLL_TIME)
+                if frame_item is None:
+                    continue
+                self._observation_stage(frame_item)
+        finally:
+            self._pipeline_stop.set()
+            for thread in threads:
+                thread.join(timeout=1)
+            frame_item = self._frame_queue.get(timeout=0)
+            if frame_item is not None:
+                self._release_frame(frame_item)
+
+        if self._pipeline_error.is_set():
+            raise Exception("A stage of the game pipeline failed")
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except Exception as error:
+            traceback.print_exc()
+            print('\n=====\nGot unexpected exception in '
+                  f'"{stage.__name__}" in Game-class. Message: {error}'
+                  '\n=====\n')
+            self._pipeline_error.set()
+
+    def _capture_stage(self):
+        """
+        Capture images at the decision rate
+        """
+        next_capture_time = time.time()
+        while not self._pipeline_stop.is_set():
+            if not self._image_source.wait_for_new_frame(
+                    timeout=FRAME_TIMEOUT):
+                self._shared_data['status'] = 'No image'
+                continue
+            start_time = time.time()
+            image, frame_token = self._image_source.acquire_frame()
+            capture_time = self._image_source.frame_timestamp
+            self._shared_data['imageCaptureDuration'] = \
+                time.time() - start_time
+            self._frame_queue.put({
+                'image': image,
+                'frame_token': frame_token,
+                'capture_time': capture_time})
+            self._shared_data['droppedFrames'] = \
+                self._frame_queue.dropped_count
+
+            next_capture_time += self._step_time
+            wait_time = next_capture_time - time.time()
+            if wait_time > 0:
+                self._pipeline_stop.wait(wait_time)
+            else:
+                next_capture_time = time.time()
+
+    def _release_frame(self, item):
+        """
+        Release the frame of a frame queue item back to the image source
+        """
+        self._image_source.release_frame(item.pop('frame_token'))
+
+    def _observation_stage(self, item):
+        """
+        Create observations from a captured image and pass them to the
+        brain stage. If there are no observations pass a stop command
+        straight to the frontend stage.
+        """
+        start_time = time.time()
+        self._image_processer.set_rendering(self._rendering_needed())
+        image = item.pop('image')
+        robot_observations_dict = \
+            self._image_processer.image_to_observations(
+                image=image, capture_time=item['capture_time'])
+        self._release_frame(item)
+        if self._image_processer.rendering:
+            with self._shared_array.get_lock():
+                self._shared_image[:] = self._image_processer.get_image()
+        self._shared_data['obsCreationDuration'] = time.time() - start_time
+        self._log_image_processing_times()
+
+        if not robot_observations_dict:
+            self._shared_data['status'] = 'No observations'
+            if self._mode == PROD or self._mode == SIMU:
+                item['actions'] = {aruco: 0 for aruco in self._robot_arucos}
+                self._action_queue.put(item)
+            return
+
+        for aruco_id in robot_observations_dict.keys():
+            self._shared_data[f'robot_{aruco_id}_lower_obs'] = \
+                robot_observations_dict[aruco_id]['lower_obs']
+            self._shared_data[f'robot_{aruco_id}_upper_obs'] = \
+                robot_observations_dict[aruco_id]['lower_obs']
+            self._shared_data['angles'] = self._image_processer.angles
+
+        if self._mode == PROD or self._mode == SIMU:
+            item['observations'] = robot_observations_dict
+            self._observation_queue.put(item)
+        else:
+            self._shared_data['status'] = 'Running in test mode'
+
+    def _brain_stage(self):
+        """
+        Get actions from the brain for the observations
+        """
+        while not self._pipeline_stop.is_set():
+            item = self._observation_queue.get(timeout=PIPELINE_POLL_TIME)
+            if item is None:
+                continue
+            start_time = time.time()
+            actions = self._brain_server.get_actions(item['observations'])
+            self._shared_data['brainDuration'] = time.time() - start_time
+            self._log_brain_responses()
+            self._shared_data['droppedObservations'] = \
+                self._observation_queue.dropped_count
+
+            item['actions'] = dict(filter(
+                lambda act: act[0] in self._robot_arucos,
+                actions.items()))
+            self._action_queue.put(item)
+
+    def _frontend_stage(self):
+        """
+        Send the actions to the frontend and log how old the image the
+        actions are based on is when the actions are sent
+        """
+        last_capture_time = None
+        while not self._pipeline_stop.is_set():
+            item = self._action_queue.get(timeout=PIPELINE_POLL_TIME)
+            if item is None:
+                continue
+            # A stop command of a newer image can overtake the actions
+            # which are still at the brain. Don't send the older actions.
+            if (last_capture_time is not None and
+                    item['capture_time'] < last_capture_time):
+                continue
+            last_capture_time = item['capture_time']
+
+            start_time = time.time()
+            _ = self._frontend.make_actions(item['actions'])
+            sent_time = time.time()
+            self._log_send_latencies()
+            self._image_processer.actions_sent(
+                item['actions'], sent_time, item['capture_time'])
+            self._shared_data['frontendDuration'] = sent_time - start_time
+            self._shared_data['photonToMotorAge'] = \
+                sent_time - item['capture_time']
+            self._shared_data['droppedActions'] = \
+                self._action_queue.dropped_count
+            if 'observations' in item:
+                self._shared_data['status'] = 'Playing game'
+
     def _end_routine(self):
-        with self._shared_array.get_lock():
-            self._shared_image[:] = self._image_processer.get_image()
+        if self._image_processer.rendering:
+            with self._shared_array.get_lock():
+                self._shared_image[:] = self._image_processer.get_image()
         self._log_time(log_name='actualDuration', log_end=True)
         wait_time = self._step_time - self._shared_data['actualDuration']
         if wait_time > 0:
             time.sleep(wait_time)
         self._log_time(log_name='totalDuration', log_end=True)
 
+    def _log_image_processing_times(self):
+        self._shared_data['arucoDetectionDuration'] = \
+            self._image_processer.aruco_detection_time
+        self._shared_data['ecoreDetectionDuration'] = \
+            self._image_processer.ecore_detection_time
+        self._shared_data['obsStepDuration'] = \
+            self._image_processer.step_time
+
+    def _log_brain_responses(self):
+        self._shared_data['lateBrainResponses'] = \
+            self._brain_server.late_responses
+        self._shared_data['droppedBrainResponses'] = \
+            self._brain_server.dropped_responses
+
+    def _log_send_latencies(self):
+        for aruco_id, send_latency in \
+                self._frontend.send_latencies.items():
+            self._shared_data[f'robot_{aruco_id}_send_latency'] = \
+                send_latency
+        for aruco_id, link_stats in self._frontend.link_stats.items():
+            for name, value in link_stats.items():
+                self._shared_data[f'robot_{aruco_id}_{name}'] = value
+
+    def _rendering_needed(self):
+        """
+        Check if the game view needs to be rendered. In headless mode it
+        is rendered only when a viewer is showing the game view.
+
+        return : boolean
+        """
+        if not self._headless:
+            return True
+        last_view_time = self._shared_data.get('viewerHeartbeat', -1)
+        return time.time() - last_view_time < VIEWER_TIMEOUT
+
     def _get_image_source_and_frontend(self, mode, params):
         if mode == PROD or mode == TEST:
             image_source = GStreamerVideoSink(params)
@@ -172,6 +432,20 @@ class Game:
                     robot_actions[aruco] = 0
                 status = self._frontend.make_actions(robot_actions)
 
+    def _close_connections(self):
+        """
+        Close the frontend and the brain if they have connections or
+        threads to close, e.g. the robots' sockets and keepalives and the
+        brain's action stream
+
+        return : Doesn't return anything
+        """
+        for connection in [
+                getattr(self, '_frontend', None),
+                getattr(self, '_brain_server', None)]:
+            if hasattr(connection, 'close'):
+                connection.close()
+
     def _log_time(self, log_name=None, log_start=False, log_end=False):
         """
         Log time a step has taken to _game_data-object with given field name
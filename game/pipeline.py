@@ -0,0 +1,53 @@
+import threading
+from collections import deque
+
+
+class DropOldestQueue():
+    """
+    Bounded queue between two pipeline stages. Putting an item to a full
+    queue drops the oldest item so the consumer always gets the freshest
+    data and the latency of the pipeline can't grow.
+    """
+    def __init__(self, maxsize=1, on_drop=None):
+        """
+        maxsize : int
+            Maximum number of items in the queue
+        on_drop : function(item)
+            Called with every dropped item, e.g. to release its resources
+        """
+        self._items = deque(maxlen=maxsize)
+        self._on_drop = on_drop
+        self._condition = threading.Condition()
+        self._dropped_count = 0
+
+    @property
+    def dropped_count(self):
+        """
+        return : int
+            Number of items dropped because the consumer was too slow
+        """
+        return self._dropped_count
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self._dropped_count += 1
+                dropped_item = self._items.popleft()
+                if self._on_drop is not None:
+                    self._on_drop(dropped_item)
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Get the oldest item from the queue
+
+        timeout : float
+            Seconds to wait for an item. None waits forever.
+
+        return : The item or None if no item was available before timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
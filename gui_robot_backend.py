@@ -73,12 +73,19 @@ def setup_variables(mode):
             "totalDurationFPS": -1,
             "imageCaptureDuration": -1,
             "obsCreationDuration": -1,
+            "arucoDetectionDuration": -1,
+            "ecoreDetectionDuration": -1,
+            "obsStepDuration": -1,
             "brainDuration": -1,
+            "lateBrainResponses": 0,
+            "droppedBrainResponses": 0,
             "frontendDuration": -1,
+            "photonToMotorAge": -1,
             "status": "Initialized",
             "lowerObs": [],
             "upperObs": [],
-            "angles": []
+            "angles": [],
+            "viewerHeartbeat": -1
         })
 
     return shared_image, shared_array, shared_state, shared_data
@@ -93,7 +100,11 @@ def print_game_data(shared_data):
         f'Limited process time: \t{shared_data["totalDuration"]*1000:5.0f}ms \n' \
         f'Image cap dur: \t\t{shared_data["imageCaptureDuration"]*1000:5.0f}ms \n' \
         f'Obs dur: \t\t{shared_data["obsCreationDuration"]*1000:5.0f}ms \n' \
+        f'Aruco det dur: \t\t{shared_data["arucoDetectionDuration"]*1000:5.0f}ms \n' \
+        f'Ecore det dur: \t\t{shared_data["ecoreDetectionDuration"]*1000:5.0f}ms \n' \
+        f'Obs step dur: \t\t{shared_data["obsStepDuration"]*1000:5.0f}ms \n' \
         f'Brain dur: \t\t{shared_data["brainDuration"]*1000:5.0f}ms \n' \
+        f'Late brain resp: \t{shared_data["lateBrainResponses"]:5d} \n' \
         f'Frontend dur: \t\t{shared_data["frontendDuration"]*1000:5.0f}ms'
     line_jumps = console_text.count('\n')+2
     print(console_text)
@@ -116,6 +127,8 @@ def main(_):
 
     try:
         while True:
+            # Tell the game that someone is watching the game view
+            shared_data['viewerHeartbeat'] = time.time()
             with shared_array.get_lock():
                 cv2.imshow('Game View', shared_image)
                 cv2.waitKey(1)
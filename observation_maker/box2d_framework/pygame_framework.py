@@ -383,7 +383,12 @@ class PygameFramework(FrameworkBase):
 
                 # pygame.display.flip()
 
-                clock.tick(self.settings.hz)
+                # In single step mode the caller paces the steps so the
+                # frame rate is not limited here
+                if single_step is True:
+                    clock.tick()
+                else:
+                    clock.tick(self.settings.hz)
                 self.fps = clock.get_fps()
 
                 if single_step is True:
@@ -12,6 +12,12 @@ class EnergyCoresHandler(object):
         self._ecore_radius = params["image_processing"]["ball_radius"]
 
     def set_transforms(self, pos_ecore_trans, neg_ecore_trans):
+        """
+        pos_ecore_trans : numpy.array(float32) [N, 2] or list [[x, y], ...]
+            Positions of the positive energy cores
+        neg_ecore_trans : numpy.array(float32) [N, 2] or list [[x, y], ...]
+            Positions of the negative energy cores
+        """
         self._handle_group(pos_ecore_trans,
                            self._pos_ecores,
                            'positive_energy_core')
@@ -53,7 +59,7 @@ class EnergyCoresHandler(object):
 
     def _activate_ball(self, ball, transform):
         ball.active = True
-        ball.position = b2Vec2(transform[0], transform[1])
+        ball.position = b2Vec2(float(transform[0]), float(transform[1]))
 
     def _deactivate_ball(self, ball):
         ball.active = False
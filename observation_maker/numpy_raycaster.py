@@ -0,0 +1,444 @@
+import numpy as np
+from Box2D import (
+    b2_pi,
+    b2_epsilon,
+    b2EdgeShape,
+    b2PolygonShape,
+    b2CircleShape)
+from itertools import cycle
+from observation_maker.raycaster import Raycaster, HIT_DISTANCE_OFFSET
+
+
+RAYS_PER_SECTOR = 3
+NO_HIT = np.float32(np.inf)
+EPSILON = np.float32(b2_epsilon)
+
+
+class NumpyRaycaster(Raycaster):
+    """
+    Analytic ray engine which intersects the rays of all robots at once
+    with NumPy instead of calling world.RayCast for every single ray.
+
+    The intersection tests follow Box2D's b2EdgeShape, b2PolygonShape and
+    b2CircleShape RayCast functions step by step in float32 so the
+    observations are the same as with the Box2D engine. Only exact ties
+    between two different fixtures can resolve differently because Box2D
+    reports the fixtures in its broadphase tree order.
+    """
+    def __init__(self, world, renderer, params):
+        super().__init__(world, renderer, params)
+        self._ray_length = params["image_processing"]["ray_length"]
+
+        line_color_picker = cycle(self._line_colors)
+        self._sector_line_colors = []
+        sector_widths = []
+        for angle in self.ray_angles:
+            line_color, _, cast_width = self.get_ray_properties(
+                angle, line_color_picker)
+            self._sector_line_colors.append(line_color)
+            sector_widths.append(cast_width)
+        self._sector_angles = np.array(self.ray_angles, dtype=np.float64)
+        self._sector_widths = np.array(sector_widths, dtype=np.float64)
+
+        # Body types are stored as indexes to this list
+        self._type_names = []
+        # Shape data per body type: ('polygon', vertices, normals)
+        # or ('circle', radius) or ('edge',)
+        self._type_shapes = {}
+        # Arena edges (walls and goals) never move so they are read from
+        # the world only once
+        self._segments = None
+
+    def cast_all(self, robots):
+        """
+        Cast the observation rays for every given robot in one batch.
+
+        robots : dict
+            key : aruco_id : int
+            value : robot's Box2D body
+
+        return : dict
+            aruco_ids : list(int)
+            types : numpy.array(int) [robots, sectors] hit body types
+            distances : numpy.array(float) [robots, sectors]
+            Use hits_to_observations to turn them into observations.
+        """
+        aruco_ids = list(robots.keys())
+        robots_hits = {
+            'aruco_ids': aruco_ids,
+            'types': np.full((0, len(self.ray_angles)), -1),
+            'distances': np.zeros((0, len(self.ray_angles)))}
+        if not robots:
+            return robots_hits
+
+        angles = []
+        positions = []
+        for aruco_id in aruco_ids:
+            robot = robots[aruco_id]
+            angles.append(robot.angle)
+            position = robot.position
+            positions.append((position.x, position.y))
+
+        starts, ends = self._create_rays(
+            np.array(angles, dtype=np.float64),
+            np.array(positions, dtype=np.float32))
+        fractions, hit_types = self._cast_rays(
+            starts.reshape(-1, 2),
+            ends.reshape(-1, 2))
+        fractions = fractions.reshape(starts.shape[:3])
+        hit_types = hit_types.reshape(starts.shape[:3])
+
+        if self.draw_rays:
+            self._draw_rays(starts, ends, fractions)
+
+        # Closest hit of the sector's parallel rays. On equal distances
+        # the first ray wins like in Raycaster.cast_single
+        closest_ray = np.argmin(fractions, axis=2)[..., np.newaxis]
+        sector_fractions = np.take_along_axis(
+            fractions, closest_ray, axis=2)[..., 0]
+        robots_hits['types'] = np.take_along_axis(
+            hit_types, closest_ray, axis=2)[..., 0]
+        robots_hits['distances'] = \
+            sector_fractions.astype(np.float64) - HIT_DISTANCE_OFFSET
+        return robots_hits
+
+    def hits_to_observations(self, robots_hits, tags):
+        """
+        Create the observations of every robot from the hits returned
+        by cast_all. The same hits can be used with different tags.
+
+        robots_hits : dict
+            Return value of cast_all
+        tags : list(str)
+            Tags in the order they appear in a sector's observation
+
+        return : dict
+            key : aruco_id : int
+            value : numpy.array(float32) observations of the robot
+        """
+        all_obs = self._hits_to_observation_array(
+            robots_hits['types'],
+            robots_hits['distances'],
+            tags)
+        return dict(zip(robots_hits['aruco_ids'], all_obs))
+
+    def _create_rays(self, car_angles, positions):
+        """
+        Create start and end points of every ray the same way as
+        Raycaster.cast_single does. Ray offsets are calculated in double
+        precision and rounded to float32 like b2Vec2 does.
+
+        car_angles : numpy.array(float64) [robots]
+        positions : numpy.array(float32) [robots, 2]
+
+        return : tuple(numpy.array(float32), numpy.array(float32))
+            Start and end points [robots, sectors, rays per sector, 2].
+            The rays of a sector are in order middle, left, right.
+        """
+        diff_angle = b2_pi / 2
+        ray_angles = \
+            car_angles[:, np.newaxis] + self._sector_angles + b2_pi / 2
+
+        d = np.stack(
+            (self._ray_length * np.cos(ray_angles),
+             self._ray_length * np.sin(ray_angles)),
+            axis=-1).astype(np.float32)
+        diff1 = np.stack(
+            (self._sector_widths * np.cos(ray_angles - diff_angle),
+             self._sector_widths * np.sin(ray_angles - diff_angle)),
+            axis=-1).astype(np.float32)
+        diff2 = np.stack(
+            (self._sector_widths * np.cos(ray_angles + diff_angle),
+             self._sector_widths * np.sin(ray_angles + diff_angle)),
+            axis=-1).astype(np.float32)
+
+        start0 = np.broadcast_to(positions[:, np.newaxis, :], d.shape)
+        start1 = positions[:, np.newaxis, :] + diff1
+        start2 = positions[:, np.newaxis, :] + diff2
+        starts = np.stack((start0, start1, start2), axis=2)
+        ends = starts + d[:, :, np.newaxis, :]
+        return starts, ends
+
+    def _cast_rays(self, starts, ends):
+        """
+        Find the closest hit for every ray.
+
+        starts : numpy.array(float32) [rays, 2]
+        ends : numpy.array(float32) [rays, 2]
+
+        return : tuple(numpy.array(float32), numpy.array(int))
+            Hit fractions of the ray lengths (inf if nothing was hit) and
+            indexes of the hit body types (-1 if nothing was hit).
+        """
+        polygons, circles = self._update_geometry()
+
+        fractions = [
+            self._cast_segments(starts, ends),
+            self._cast_polygons(starts, ends, polygons),
+            self._cast_circles(starts, ends, circles)]
+        types = [
+            self._segments['types'],
+            polygons['types'],
+            circles['types']]
+
+        fractions = np.concatenate(fractions, axis=1)
+        types = np.concatenate(types + [[-1]]).astype(np.intp)
+        # Rays which don't hit anything point to the -1 type added above
+        closest = np.argmin(fractions, axis=1)
+        closest_fractions = fractions[np.arange(len(starts)), closest]
+        closest[closest_fractions == NO_HIT] = len(types) - 1
+        return closest_fractions, types[closest]
+
+    def _type_index(self, body_type):
+        if body_type not in self._type_names:
+            self._type_names.append(body_type)
+        return self._type_names.index(body_type)
+
+    def _update_geometry(self):
+        """
+        Read the active robot and energy core bodies from the world.
+
+        return : tuple(dict, dict)
+            Polygon and circle data as numpy arrays
+        """
+        if self._segments is None:
+            self._read_segments()
+
+        polygon_types = []
+        polygon_transforms = []
+        polygon_vertices = []
+        polygon_normals = []
+        circle_types = []
+        circle_data = []
+        for body in self.world.bodies:
+            if body.userData is None or not body.active:
+                continue
+            body_type = body.userData['type']
+            if body_type not in self._type_shapes:
+                self._type_shapes[body_type] = self._read_shape(body)
+            shape = self._type_shapes[body_type]
+
+            if shape[0] == 'polygon':
+                transform = body.transform
+                position = transform.position
+                polygon_types.append(self._type_index(body_type))
+                polygon_transforms.append(
+                    (position.x, position.y, transform.q.c, transform.q.s))
+                polygon_vertices.append(shape[1])
+                polygon_normals.append(shape[2])
+            elif shape[0] == 'circle':
+                position = body.position
+                circle_types.append(self._type_index(body_type))
+                circle_data.append((position.x, position.y, shape[1]))
+
+        polygons = {
+            'types': np.array(polygon_types, dtype=np.intp),
+            'transforms': np.array(
+                polygon_transforms, dtype=np.float32).reshape(-1, 4),
+            'vertices': np.array(polygon_vertices, dtype=np.float32),
+            'normals': np.array(polygon_normals, dtype=np.float32)}
+        circles = {
+            'types': np.array(circle_types, dtype=np.intp),
+            'data': np.array(circle_data, dtype=np.float32).reshape(-1, 3)}
+        return polygons, circles
+
+    def _read_shape(self, body):
+        shape = body.fixtures[0].shape
+        if isinstance(shape, b2PolygonShape):
+            return ('polygon', list(shape.vertices), list(shape.normals))
+        elif isinstance(shape, b2CircleShape):
+            return ('circle', shape.radius)
+        elif isinstance(shape, b2EdgeShape):
+            return ('edge',)
+        raise Exception('\n=====\nUnsupported shape for NumpyRaycaster: '
+                        f'{type(shape)}\n=====\n')
+
+    def _read_segments(self):
+        """
+        Read all edge shapes from the world. The arena bodies are in the
+        world's origin so the edge vertices are used as they are.
+        """
+        segment_types = []
+        vertices = []
+        for body in self.world.bodies:
+            if body.userData is None:
+                continue
+            for fixture in body.fixtures:
+                if not isinstance(fixture.shape, b2EdgeShape):
+                    continue
+                self._type_shapes[body.userData['type']] = ('edge',)
+                segment_types.append(
+                    self._type_index(body.userData['type']))
+                vertices.append(fixture.shape.vertices)
+
+        vertices = np.array(vertices, dtype=np.float32).reshape(-1, 2, 2)
+        v1 = vertices[:, 0]
+        v2 = vertices[:, 1]
+        e = v2 - v1
+        # Same as b2Vec2.Normalize() in Box2D
+        normals = np.stack((e[:, 1], -e[:, 0]), axis=-1)
+        length = np.sqrt(normals[:, 0] * normals[:, 0] +
+                         normals[:, 1] * normals[:, 1])
+        # Zero length edges can't be hit so they are left out
+        keep = length >= EPSILON
+        normals = normals[keep] * (np.float32(1.0) / length[keep, np.newaxis])
+
+        r = e[keep]
+        self._segments = {
+            'types': np.array(segment_types, dtype=np.intp)[keep],
+            'v1': v1[keep],
+            'normals': normals,
+            'r': r,
+            'rr': r[:, 0] * r[:, 0] + r[:, 1] * r[:, 1]}
+
+    def _cast_segments(self, starts, ends):
+        """
+        Ray cast against the arena edges like b2EdgeShape::RayCast.
+
+        return : numpy.array(float32) [rays, edges]
+        """
+        segments = self._segments
+        p1x = starts[:, 0, np.newaxis]
+        p1y = starts[:, 1, np.newaxis]
+        dx = ends[:, 0, np.newaxis] - p1x
+        dy = ends[:, 1, np.newaxis] - p1y
+        v1x = segments['v1'][:, 0]
+        v1y = segments['v1'][:, 1]
+        nx = segments['normals'][:, 0]
+        ny = segments['normals'][:, 1]
+
+        numerator = nx * (v1x - p1x) + ny * (v1y - p1y)
+        denominator = nx * dx + ny * dy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = numerator / denominator
+            hit = (denominator != 0) & (t >= 0) & (t <= 1)
+
+            qx = p1x + t * dx
+            qy = p1y + t * dy
+            s = ((qx - v1x) * segments['r'][:, 0] +
+                 (qy - v1y) * segments['r'][:, 1]) / segments['rr']
+            hit &= (s >= 0) & (s <= 1)
+        return np.where(hit, t, NO_HIT)
+
+    def _cast_polygons(self, starts, ends, polygons):
+        """
+        Ray cast against the robots like b2PolygonShape::RayCast. Rays
+        starting inside a polygon don't hit it.
+
+        return : numpy.array(float32) [rays, polygons]
+        """
+        if len(polygons['types']) == 0:
+            return np.empty((len(starts), 0), dtype=np.float32)
+        px = polygons['transforms'][:, 0]
+        py = polygons['transforms'][:, 1]
+        c = polygons['transforms'][:, 2]
+        s = polygons['transforms'][:, 3]
+
+        # Put the rays into the polygons' frames of reference
+        tx = starts[:, 0, np.newaxis] - px
+        ty = starts[:, 1, np.newaxis] - py
+        p1x = c * tx + s * ty
+        p1y = -s * tx + c * ty
+        tx = ends[:, 0, np.newaxis] - px
+        ty = ends[:, 1, np.newaxis] - py
+        dx = (c * tx + s * ty) - p1x
+        dy = (-s * tx + c * ty) - p1y
+
+        lower = np.zeros(p1x.shape, dtype=np.float32)
+        upper = np.ones(p1x.shape, dtype=np.float32)
+        index = np.full(p1x.shape, -1)
+        inside = np.ones(p1x.shape, dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(polygons['vertices'].shape[1]):
+                nx = polygons['normals'][:, i, 0]
+                ny = polygons['normals'][:, i, 1]
+                numerator = \
+                    nx * (polygons['vertices'][:, i, 0] - p1x) + \
+                    ny * (polygons['vertices'][:, i, 1] - p1y)
+                denominator = nx * dx + ny * dy
+                fraction = numerator / denominator
+
+                inside &= ~((denominator == 0) & (numerator < 0))
+                entering = \
+                    (denominator < 0) & (numerator < lower * denominator)
+                leaving = \
+                    (denominator > 0) & (numerator < upper * denominator)
+                lower = np.where(entering, fraction, lower)
+                index = np.where(entering, i, index)
+                upper = np.where(leaving, fraction, upper)
+                inside &= ~(upper < lower)
+
+        return np.where(inside & (index >= 0), lower, NO_HIT)
+
+    def _cast_circles(self, starts, ends, circles):
+        """
+        Ray cast against the energy cores like b2CircleShape::RayCast.
+
+        return : numpy.array(float32) [rays, circles]
+        """
+        radius = circles['data'][:, 2]
+        sx = starts[:, 0, np.newaxis] - circles['data'][:, 0]
+        sy = starts[:, 1, np.newaxis] - circles['data'][:, 1]
+        b = (sx * sx + sy * sy) - radius * radius
+
+        rx = ends[:, 0, np.newaxis] - starts[:, 0, np.newaxis]
+        ry = ends[:, 1, np.newaxis] - starts[:, 1, np.newaxis]
+        c = sx * rx + sy * ry
+        rr = rx * rx + ry * ry
+        sigma = c * c - rr * b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a = -(c + np.sqrt(sigma))
+            hit = (sigma >= 0) & (rr >= EPSILON) & (a >= 0) & (a <= rr)
+            return np.where(hit, a / rr, NO_HIT)
+
+    def _hits_to_observation_array(self, hit_types, hit_distances, tags):
+        """
+        Vectorized version of Raycaster._hits_to_observations.
+
+        hit_types : numpy.array(int) [robots, sectors]
+        hit_distances : numpy.array(float) [robots, sectors]
+        tags : list(str)
+
+        return : numpy.array(float32) [robots, observations]
+        """
+        single_obs_len = len(tags) + 2
+        # Observation column for every body type. Types not in the tags
+        # and rays without a hit (type -1) point to the last item, -1
+        columns = np.array(
+            [tags.index(name) if name in tags else -1
+             for name in self._type_names] + [-1])
+        hit_columns = columns[hit_types]
+        tagged = hit_columns >= 0
+
+        all_obs = np.zeros(
+            hit_types.shape + (single_obs_len,), dtype=np.float32)
+        robot_index, sector_index = np.nonzero(tagged)
+        all_obs[robot_index, sector_index, hit_columns[tagged]] = 1.0
+        all_obs[robot_index, sector_index, single_obs_len - 1] = \
+            hit_distances[tagged]
+        all_obs[~tagged, single_obs_len - 2] = 1.0
+        # The explicit length keeps the shape when there are no robots
+        return all_obs.reshape(
+            hit_types.shape[0], hit_types.shape[1] * single_obs_len)
+
+    def _draw_rays(self, starts, ends, fractions):
+        """
+        Draw the rays like Raycaster.cast_single does. Rays which hit
+        something end to the hit point.
+        """
+        hit = fractions != NO_HIT
+        hit_fractions = np.where(hit, fractions, 1)[..., np.newaxis]
+        ray_ends = (1 - hit_fractions) * starts + hit_fractions * ends
+
+        sector_count = len(self._sector_line_colors)
+        for ray_index, (start, end, is_hit) in enumerate(zip(
+                starts.reshape(-1, 2).tolist(),
+                ray_ends.reshape(-1, 2).tolist(),
+                hit.ravel().tolist())):
+            sector_index = ray_index // RAYS_PER_SECTOR % sector_count
+            line_color = self._sector_line_colors[sector_index]
+            point1 = self.renderer.to_screen(start)
+            point2 = self.renderer.to_screen(end)
+            if is_hit:
+                self.renderer.DrawPoint(point2, 5.0, self.p1_color)
+            self.renderer.DrawSegment(point1, point2, line_color)
@@ -111,12 +111,35 @@ class ObservationMaker(Framework):
             self.renderer)
 
         self._message = None
+        self._rendering = True
+        self._step_time = 0
         self._stepper = self.run(single_step=True)
 
     @property
     def angles(self):
         return self._friendly_robots_handler.angles
 
+    @property
+    def step_time(self):
+        """
+        return : float
+            Duration of the latest observation step in seconds
+        """
+        return self._step_time
+
+    @property
+    def rendering(self):
+        return self._rendering
+
+    def set_rendering(self, rendering):
+        """
+        Enable or disable rendering the game view. Without rendering the
+        observation step only updates the Box2D bodies and casts the rays
+        and the image returned by get_image is not updated.
+        """
+        self._rendering = rendering
+        self._friendly_robots_handler.set_drawing(rendering)
+
     def get_image(self):
         image = self.GetScreenCapture()
         image = cv2.cvtColor(image, cv2.COLOR_RGBA2BGR)
@@ -130,10 +153,11 @@ class ObservationMaker(Framework):
         [max_x / 2, max_y / 2] is in top right corner
 
         opencv_coords : list [[x1, y1], [x2, y2], [x3, y3], ... ]
-            List of coordinate pairs in list
+            List of coordinate pairs in list or numpy.array [N, 2]
 
         return : list [[x1, y1], [x2, y2], [x3, y3], ... ]
-            List of coordinate pairs in list
+            List of coordinate pairs in list or numpy.array [N, 2] if
+            a numpy.array [N, 2] was given
         """
         def mod(opencv_coords):
             # If list in the list
@@ -146,7 +170,12 @@ class ObservationMaker(Framework):
                 return [opencv_coords[0] - self._width / 2,
                         -opencv_coords[1] + self._height / 2]
 
-        if not opencv_coords:
+        if isinstance(opencv_coords, np.ndarray) and opencv_coords.ndim == 2:
+            box2d_coords = np.empty_like(opencv_coords)
+            box2d_coords[:, 0] = opencv_coords[:, 0] - self._width / 2
+            box2d_coords[:, 1] = -opencv_coords[:, 1] + self._height / 2
+            return box2d_coords
+        elif not len(opencv_coords):
             return opencv_coords
         elif isinstance(opencv_coords, dict):
             for key in opencv_coords.keys():
@@ -161,8 +190,9 @@ class ObservationMaker(Framework):
                             f'{opencv_coords}\n=====\n')
 
     def update_image(self, image, message):
-        self.SetBackground(image)
-        self._message = message
+        if self._rendering:
+            self.SetBackground(image)
+            self._message = message
         self._ecores_handler.set_transforms([], [])
         self._friendly_robots_handler.set_transforms({})
         self._enemy_robots_handler.set_transforms({})
@@ -180,7 +210,8 @@ class ObservationMaker(Framework):
         """
         # Set background image to the simulation. Only needed
         # for visual purposes. Not needed for getting observations.
-        self.SetBackground(image)
+        if self._rendering:
+            self.SetBackground(image)
 
         self._ecores_handler.set_transforms(
             self._coords_mod(pos_ecore_transforms),
@@ -203,9 +234,7 @@ class ObservationMaker(Framework):
         """
         Called by super class
         """
-        self._ecores_handler.update()
-        self._enemy_robots_handler.update()
-        self._friendly_robots_handler.update()
+        self._update_handlers()
         super(ObservationMaker, self).Step(settings)
         # self._overdraw_with_colors()
 
@@ -216,7 +245,19 @@ class ObservationMaker(Framework):
         self._CaptureScreen()
 
     def _make_step(self):
-        next(self._stepper)
+        step_start_time = time.time()
+        if self._rendering:
+            next(self._stepper)
+        else:
+            # The bodies are static so Box2D's broadphase is already up
+            # to date for ray casting without stepping the world
+            self._update_handlers()
+        self._step_time = time.time() - step_start_time
+
+    def _update_handlers(self):
+        self._ecores_handler.update()
+        self._enemy_robots_handler.update()
+        self._friendly_robots_handler.update()
 
     # def _overdraw_with_colors(self):
     #     self.world.renderer.DrawSolidPolygon([[0, 0], [500, 0], [0, 1080]], b2Color(1, 0, 1))
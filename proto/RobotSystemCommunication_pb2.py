@@ -2,10 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: proto/RobotSystemCommunication.proto
 """Generated protocol buffer code."""
-from google.protobuf.internal import enum_type_wrapper
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -14,846 +13,59 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='proto/RobotSystemCommunication.proto',
-  package='robotsystemcommunication',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n$proto/RobotSystemCommunication.proto\x12\x18robotsystemcommunication\"^\n\x12RobotActionRequest\x12\x17\n\x0fleftMotorAction\x18\x01 \x01(\x05\x12\x18\n\x10rightMotorAction\x18\x02 \x01(\x05\x12\x15\n\ractionTimeout\x18\x03 \x01(\x05\"K\n\x13RobotActionResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.robotsystemcommunication.StatusType\"\x12\n\x10RobotPingRequest\":\n\x11RobotPingResponse\x12\x11\n\tipAddress\x18\x01 \x01(\t\x12\x12\n\nmacAddress\x18\x02 \x01(\t\"\x9d\x01\n\x0cRobotRequest\x12\r\n\x05reqId\x18\x01 \x01(\r\x12;\n\x03\x61\x63t\x18\n \x01(\x0b\x32,.robotsystemcommunication.RobotActionRequestH\x00\x12:\n\x04ping\x18\x0b \x01(\x0b\x32*.robotsystemcommunication.RobotPingRequestH\x00\x42\x05\n\x03req\"\xa1\x01\n\rRobotResponse\x12\r\n\x05reqId\x18\x01 \x01(\r\x12<\n\x03\x61\x63t\x18\n \x01(\x0b\x32-.robotsystemcommunication.RobotActionResponseH\x00\x12;\n\x04ping\x18\x0b \x01(\x0b\x32+.robotsystemcommunication.RobotPingResponseH\x00\x42\x06\n\x04resp\"M\n\x13\x42rainActionResponse\x12\x36\n\x07\x61\x63tions\x18\x01 \x03(\x0b\x32%.robotsystemcommunication.RobotAction\"4\n\x0bRobotAction\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\x05\x12\x15\n\rarucoMarkerID\x18\x02 \x01(\x05\"R\n\x12\x42rainActionRequest\x12<\n\x0cobservations\x18\x01 \x03(\x0b\x32&.robotsystemcommunication.Observations\"[\n\x0cObservations\x12\x19\n\x11lowerObservations\x18\x01 \x03(\x02\x12\x19\n\x11upperObservations\x18\x02 \x03(\x02\x12\x15\n\rarucoMarkerID\x18\x03 \x01(\x05\"0\n\x1fSimulationScreenCaptureResponse\x12\r\n\x05image\x18\x01 \x01(\x0c\"\x8b\x01\n\x1eSimulationScreenCaptureRequest\x12\x0e\n\x06height\x18\x01 \x01(\x05\x12\r\n\x05widht\x18\x02 \x01(\x05\x12\x36\n\timageType\x18\x03 \x01(\x0e\x32#.robotsystemcommunication.ImageType\x12\x12\n\njpgQuality\x18\x04 \x01(\x05\"Q\n\x17SimulationActionRequest\x12\x36\n\x07\x61\x63tions\x18\x01 \x03(\x0b\x32%.robotsystemcommunication.RobotAction\"P\n\x18SimulationActionResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.robotsystemcommunication.StatusType*,\n\nStatusType\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x06\n\x02OK\x10\x01\x12\t\n\x05\x45RROR\x10\x02*\x1d\n\tImageType\x12\x07\n\x03JPG\x10\x00\x12\x07\n\x03PNG\x10\x01\x32|\n\rRobotFrontend\x12k\n\nMakeAction\x12,.robotsystemcommunication.RobotActionRequest\x1a-.robotsystemcommunication.RobotActionResponse\"\x00\x32y\n\x0b\x42rainServer\x12j\n\tGetAction\x12,.robotsystemcommunication.BrainActionRequest\x1a-.robotsystemcommunication.BrainActionResponse\"\x00\x32\x95\x02\n\x10SimulationServer\x12\x89\x01\n\x10GetScreenCapture\x12\x38.robotsystemcommunication.SimulationScreenCaptureRequest\x1a\x39.robotsystemcommunication.SimulationScreenCaptureResponse\"\x00\x12u\n\nMakeAction\x12\x31.robotsystemcommunication.SimulationActionRequest\x1a\x32.robotsystemcommunication.SimulationActionResponse\"\x00\x62\x06proto3'
-)
-
-_STATUSTYPE = _descriptor.EnumDescriptor(
-  name='StatusType',
-  full_name='robotsystemcommunication.StatusType',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='UNKNOWN', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='OK', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='ERROR', index=2, number=2,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=1310,
-  serialized_end=1354,
-)
-_sym_db.RegisterEnumDescriptor(_STATUSTYPE)
-
-StatusType = enum_type_wrapper.EnumTypeWrapper(_STATUSTYPE)
-_IMAGETYPE = _descriptor.EnumDescriptor(
-  name='ImageType',
-  full_name='robotsystemcommunication.ImageType',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='JPG', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='PNG', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=1356,
-  serialized_end=1385,
-)
-_sym_db.RegisterEnumDescriptor(_IMAGETYPE)
-
-ImageType = enum_type_wrapper.EnumTypeWrapper(_IMAGETYPE)
-UNKNOWN = 0
-OK = 1
-ERROR = 2
-JPG = 0
-PNG = 1
-
-
-
-_ROBOTACTIONREQUEST = _descriptor.Descriptor(
-  name='RobotActionRequest',
-  full_name='robotsystemcommunication.RobotActionRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='leftMotorAction', full_name='robotsystemcommunication.RobotActionRequest.leftMotorAction', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='rightMotorAction', full_name='robotsystemcommunication.RobotActionRequest.rightMotorAction', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='actionTimeout', full_name='robotsystemcommunication.RobotActionRequest.actionTimeout', index=2,
-      number=3, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=66,
-  serialized_end=160,
-)
-
-
-_ROBOTACTIONRESPONSE = _descriptor.Descriptor(
-  name='RobotActionResponse',
-  full_name='robotsystemcommunication.RobotActionResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='status', full_name='robotsystemcommunication.RobotActionResponse.status', index=0,
-      number=1, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=162,
-  serialized_end=237,
-)
-
-
-_ROBOTPINGREQUEST = _descriptor.Descriptor(
-  name='RobotPingRequest',
-  full_name='robotsystemcommunication.RobotPingRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=239,
-  serialized_end=257,
-)
-
-
-_ROBOTPINGRESPONSE = _descriptor.Descriptor(
-  name='RobotPingResponse',
-  full_name='robotsystemcommunication.RobotPingResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='ipAddress', full_name='robotsystemcommunication.RobotPingResponse.ipAddress', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='macAddress', full_name='robotsystemcommunication.RobotPingResponse.macAddress', index=1,
-      number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=259,
-  serialized_end=317,
-)
-
-
-_ROBOTREQUEST = _descriptor.Descriptor(
-  name='RobotRequest',
-  full_name='robotsystemcommunication.RobotRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='reqId', full_name='robotsystemcommunication.RobotRequest.reqId', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='act', full_name='robotsystemcommunication.RobotRequest.act', index=1,
-      number=10, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='ping', full_name='robotsystemcommunication.RobotRequest.ping', index=2,
-      number=11, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-    _descriptor.OneofDescriptor(
-      name='req', full_name='robotsystemcommunication.RobotRequest.req',
-      index=0, containing_type=None,
-      create_key=_descriptor._internal_create_key,
-    fields=[]),
-  ],
-  serialized_start=320,
-  serialized_end=477,
-)
-
-
-_ROBOTRESPONSE = _descriptor.Descriptor(
-  name='RobotResponse',
-  full_name='robotsystemcommunication.RobotResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='reqId', full_name='robotsystemcommunication.RobotResponse.reqId', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='act', full_name='robotsystemcommunication.RobotResponse.act', index=1,
-      number=10, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='ping', full_name='robotsystemcommunication.RobotResponse.ping', index=2,
-      number=11, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-    _descriptor.OneofDescriptor(
-      name='resp', full_name='robotsystemcommunication.RobotResponse.resp',
-      index=0, containing_type=None,
-      create_key=_descriptor._internal_create_key,
-    fields=[]),
-  ],
-  serialized_start=480,
-  serialized_end=641,
-)
-
-
-_BRAINACTIONRESPONSE = _descriptor.Descriptor(
-  name='BrainActionResponse',
-  full_name='robotsystemcommunication.BrainActionResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='actions', full_name='robotsystemcommunication.BrainActionResponse.actions', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=643,
-  serialized_end=720,
-)
-
-
-_ROBOTACTION = _descriptor.Descriptor(
-  name='RobotAction',
-  full_name='robotsystemcommunication.RobotAction',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='action', full_name='robotsystemcommunication.RobotAction.action', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='arucoMarkerID', full_name='robotsystemcommunication.RobotAction.arucoMarkerID', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=722,
-  serialized_end=774,
-)
-
-
-_BRAINACTIONREQUEST = _descriptor.Descriptor(
-  name='BrainActionRequest',
-  full_name='robotsystemcommunication.BrainActionRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='observations', full_name='robotsystemcommunication.BrainActionRequest.observations', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=776,
-  serialized_end=858,
-)
-
-
-_OBSERVATIONS = _descriptor.Descriptor(
-  name='Observations',
-  full_name='robotsystemcommunication.Observations',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='lowerObservations', full_name='robotsystemcommunication.Observations.lowerObservations', index=0,
-      number=1, type=2, cpp_type=6, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='upperObservations', full_name='robotsystemcommunication.Observations.upperObservations', index=1,
-      number=2, type=2, cpp_type=6, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='arucoMarkerID', full_name='robotsystemcommunication.Observations.arucoMarkerID', index=2,
-      number=3, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=860,
-  serialized_end=951,
-)
-
-
-_SIMULATIONSCREENCAPTURERESPONSE = _descriptor.Descriptor(
-  name='SimulationScreenCaptureResponse',
-  full_name='robotsystemcommunication.SimulationScreenCaptureResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='image', full_name='robotsystemcommunication.SimulationScreenCaptureResponse.image', index=0,
-      number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=953,
-  serialized_end=1001,
-)
-
-
-_SIMULATIONSCREENCAPTUREREQUEST = _descriptor.Descriptor(
-  name='SimulationScreenCaptureRequest',
-  full_name='robotsystemcommunication.SimulationScreenCaptureRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='height', full_name='robotsystemcommunication.SimulationScreenCaptureRequest.height', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='widht', full_name='robotsystemcommunication.SimulationScreenCaptureRequest.widht', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='imageType', full_name='robotsystemcommunication.SimulationScreenCaptureRequest.imageType', index=2,
-      number=3, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='jpgQuality', full_name='robotsystemcommunication.SimulationScreenCaptureRequest.jpgQuality', index=3,
-      number=4, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1004,
-  serialized_end=1143,
-)
-
-
-_SIMULATIONACTIONREQUEST = _descriptor.Descriptor(
-  name='SimulationActionRequest',
-  full_name='robotsystemcommunication.SimulationActionRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='actions', full_name='robotsystemcommunication.SimulationActionRequest.actions', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1145,
-  serialized_end=1226,
-)
-
-
-_SIMULATIONACTIONRESPONSE = _descriptor.Descriptor(
-  name='SimulationActionResponse',
-  full_name='robotsystemcommunication.SimulationActionResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='status', full_name='robotsystemcommunication.SimulationActionResponse.status', index=0,
-      number=1, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1228,
-  serialized_end=1308,
-)
-
-_ROBOTACTIONRESPONSE.fields_by_name['status'].enum_type = _STATUSTYPE
-_ROBOTREQUEST.fields_by_name['act'].message_type = _ROBOTACTIONREQUEST
-_ROBOTREQUEST.fields_by_name['ping'].message_type = _ROBOTPINGREQUEST
-_ROBOTREQUEST.oneofs_by_name['req'].fields.append(
-  _ROBOTREQUEST.fields_by_name['act'])
-_ROBOTREQUEST.fields_by_name['act'].containing_oneof = _ROBOTREQUEST.oneofs_by_name['req']
-_ROBOTREQUEST.oneofs_by_name['req'].fields.append(
-  _ROBOTREQUEST.fields_by_name['ping'])
-_ROBOTREQUEST.fields_by_name['ping'].containing_oneof = _ROBOTREQUEST.oneofs_by_name['req']
-_ROBOTRESPONSE.fields_by_name['act'].message_type = _ROBOTACTIONRESPONSE
-_ROBOTRESPONSE.fields_by_name['ping'].message_type = _ROBOTPINGRESPONSE
-_ROBOTRESPONSE.oneofs_by_name['resp'].fields.append(
-  _ROBOTRESPONSE.fields_by_name['act'])
-_ROBOTRESPONSE.fields_by_name['act'].containing_oneof = _ROBOTRESPONSE.oneofs_by_name['resp']
-_ROBOTRESPONSE.oneofs_by_name['resp'].fields.append(
-  _ROBOTRESPONSE.fields_by_name['ping'])
-_ROBOTRESPONSE.fields_by_name['ping'].containing_oneof = _ROBOTRESPONSE.oneofs_by_name['resp']
-_BRAINACTIONRESPONSE.fields_by_name['actions'].message_type = _ROBOTACTION
-_BRAINACTIONREQUEST.fields_by_name['observations'].message_type = _OBSERVATIONS
-_SIMULATIONSCREENCAPTUREREQUEST.fields_by_name['imageType'].enum_type = _IMAGETYPE
-_SIMULATIONACTIONREQUEST.fields_by_name['actions'].message_type = _ROBOTACTION
-_SIMULATIONACTIONRESPONSE.fields_by_name['status'].enum_type = _STATUSTYPE
-DESCRIPTOR.message_types_by_name['RobotActionRequest'] = _ROBOTACTIONREQUEST
-DESCRIPTOR.message_types_by_name['RobotActionResponse'] = _ROBOTACTIONRESPONSE
-DESCRIPTOR.message_types_by_name['RobotPingRequest'] = _ROBOTPINGREQUEST
-DESCRIPTOR.message_types_by_name['RobotPingResponse'] = _ROBOTPINGRESPONSE
-DESCRIPTOR.message_types_by_name['RobotRequest'] = _ROBOTREQUEST
-DESCRIPTOR.message_types_by_name['RobotResponse'] = _ROBOTRESPONSE
-DESCRIPTOR.message_types_by_name['BrainActionResponse'] = _BRAINACTIONRESPONSE
-DESCRIPTOR.message_types_by_name['RobotAction'] = _ROBOTACTION
-DESCRIPTOR.message_types_by_name['BrainActionRequest'] = _BRAINACTIONREQUEST
-DESCRIPTOR.message_types_by_name['Observations'] = _OBSERVATIONS
-DESCRIPTOR.message_types_by_name['SimulationScreenCaptureResponse'] = _SIMULATIONSCREENCAPTURERESPONSE
-DESCRIPTOR.message_types_by_name['SimulationScreenCaptureRequest'] = _SIMULATIONSCREENCAPTUREREQUEST
-DESCRIPTOR.message_types_by_name['SimulationActionRequest'] = _SIMULATIONACTIONREQUEST
-DESCRIPTOR.message_types_by_name['SimulationActionResponse'] = _SIMULATIONACTIONRESPONSE
-DESCRIPTOR.enum_types_by_name['StatusType'] = _STATUSTYPE
-DESCRIPTOR.enum_types_by_name['ImageType'] = _IMAGETYPE
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-RobotActionRequest = _reflection.GeneratedProtocolMessageType('RobotActionRequest', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTACTIONREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotActionRequest)
-  })
-_sym_db.RegisterMessage(RobotActionRequest)
-
-RobotActionResponse = _reflection.GeneratedProtocolMessageType('RobotActionResponse', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTACTIONRESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotActionResponse)
-  })
-_sym_db.RegisterMessage(RobotActionResponse)
-
-RobotPingRequest = _reflection.GeneratedProtocolMessageType('RobotPingRequest', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTPINGREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotPingRequest)
-  })
-_sym_db.RegisterMessage(RobotPingRequest)
-
-RobotPingResponse = _reflection.GeneratedProtocolMessageType('RobotPingResponse', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTPINGRESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotPingResponse)
-  })
-_sym_db.RegisterMessage(RobotPingResponse)
-
-RobotRequest = _reflection.GeneratedProtocolMessageType('RobotRequest', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotRequest)
-  })
-_sym_db.RegisterMessage(RobotRequest)
-
-RobotResponse = _reflection.GeneratedProtocolMessageType('RobotResponse', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTRESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotResponse)
-  })
-_sym_db.RegisterMessage(RobotResponse)
-
-BrainActionResponse = _reflection.GeneratedProtocolMessageType('BrainActionResponse', (_message.Message,), {
-  'DESCRIPTOR' : _BRAINACTIONRESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.BrainActionResponse)
-  })
-_sym_db.RegisterMessage(BrainActionResponse)
-
-RobotAction = _reflection.GeneratedProtocolMessageType('RobotAction', (_message.Message,), {
-  'DESCRIPTOR' : _ROBOTACTION,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.RobotAction)
-  })
-_sym_db.RegisterMessage(RobotAction)
-
-BrainActionRequest = _reflection.GeneratedProtocolMessageType('BrainActionRequest', (_message.Message,), {
-  'DESCRIPTOR' : _BRAINACTIONREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.BrainActionRequest)
-  })
-_sym_db.RegisterMessage(BrainActionRequest)
-
-Observations = _reflection.GeneratedProtocolMessageType('Observations', (_message.Message,), {
-  'DESCRIPTOR' : _OBSERVATIONS,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.Observations)
-  })
-_sym_db.RegisterMessage(Observations)
-
-SimulationScreenCaptureResponse = _reflection.GeneratedProtocolMessageType('SimulationScreenCaptureResponse', (_message.Message,), {
-  'DESCRIPTOR' : _SIMULATIONSCREENCAPTURERESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.SimulationScreenCaptureResponse)
-  })
-_sym_db.RegisterMessage(SimulationScreenCaptureResponse)
-
-SimulationScreenCaptureRequest = _reflection.GeneratedProtocolMessageType('SimulationScreenCaptureRequest', (_message.Message,), {
-  'DESCRIPTOR' : _SIMULATIONSCREENCAPTUREREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.SimulationScreenCaptureRequest)
-  })
-_sym_db.RegisterMessage(SimulationScreenCaptureRequest)
-
-SimulationActionRequest = _reflection.GeneratedProtocolMessageType('SimulationActionRequest', (_message.Message,), {
-  'DESCRIPTOR' : _SIMULATIONACTIONREQUEST,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.SimulationActionRequest)
-  })
-_sym_db.RegisterMessage(SimulationActionRequest)
-
-SimulationActionResponse = _reflection.GeneratedProtocolMessageType('SimulationActionResponse', (_message.Message,), {
-  'DESCRIPTOR' : _SIMULATIONACTIONRESPONSE,
-  '__module__' : 'proto.RobotSystemCommunication_pb2'
-  # @@protoc_insertion_point(class_scope:robotsystemcommunication.SimulationActionResponse)
-  })
-_sym_db.RegisterMessage(SimulationActionResponse)
-
-
-
-_ROBOTFRONTEND = _descriptor.ServiceDescriptor(
-  name='RobotFrontend',
-  full_name='robotsystemcommunication.RobotFrontend',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=1387,
-  serialized_end=1511,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='MakeAction',
-    full_name='robotsystemcommunication.RobotFrontend.MakeAction',
-    index=0,
-    containing_service=None,
-    input_type=_ROBOTACTIONREQUEST,
-    output_type=_ROBOTACTIONRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_ROBOTFRONTEND)
-
-DESCRIPTOR.services_by_name['RobotFrontend'] = _ROBOTFRONTEND
-
-
-_BRAINSERVER = _descriptor.ServiceDescriptor(
-  name='BrainServer',
-  full_name='robotsystemcommunication.BrainServer',
-  file=DESCRIPTOR,
-  index=1,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=1513,
-  serialized_end=1634,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='GetAction',
-    full_name='robotsystemcommunication.BrainServer.GetAction',
-    index=0,
-    containing_service=None,
-    input_type=_BRAINACTIONREQUEST,
-    output_type=_BRAINACTIONRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_BRAINSERVER)
-
-DESCRIPTOR.services_by_name['BrainServer'] = _BRAINSERVER
-
-
-_SIMULATIONSERVER = _descriptor.ServiceDescriptor(
-  name='SimulationServer',
-  full_name='robotsystemcommunication.SimulationServer',
-  file=DESCRIPTOR,
-  index=2,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=1637,
-  serialized_end=1914,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='GetScreenCapture',
-    full_name='robotsystemcommunication.SimulationServer.GetScreenCapture',
-    index=0,
-    containing_service=None,
-    input_type=_SIMULATIONSCREENCAPTUREREQUEST,
-    output_type=_SIMULATIONSCREENCAPTURERESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='MakeAction',
-    full_name='robotsystemcommunication.SimulationServer.MakeAction',
-    index=1,
-    containing_service=None,
-    input_type=_SIMULATIONACTIONREQUEST,
-    output_type=_SIMULATIONACTIONRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_SIMULATIONSERVER)
-
-DESCRIPTOR.services_by_name['SimulationServer'] = _SIMULATIONSERVER
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n$proto/RobotSystemCommunication.proto\x12\x18robotsystemcommunication\"^\n\x12RobotActionRequest\x12\x17\n\x0fleftMotorAction\x18\x01 \x01(\x05\x12\x18\n\x10rightMotorAction\x18\x02 \x01(\x05\x12\x15\n\ractionTimeout\x18\x03 \x01(\x05\"K\n\x13RobotActionResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.robotsystemcommunication.StatusType\"\x12\n\x10RobotPingRequest\":\n\x11RobotPingResponse\x12\x11\n\tipAddress\x18\x01 \x01(\t\x12\x12\n\nmacAddress\x18\x02 \x01(\t\"d\n\x10RobotBatchAction\x12\x15\n\rarucoMarkerID\x18\x01 \x01(\x05\x12\x39\n\x03\x61\x63t\x18\x02 \x01(\x0b\x32,.robotsystemcommunication.RobotActionRequest\"V\n\x17RobotBatchActionRequest\x12;\n\x07\x61\x63tions\x18\x01 \x03(\x0b\x32*.robotsystemcommunication.RobotBatchAction\"\xe1\x01\n\x0cRobotRequest\x12\r\n\x05reqId\x18\x01 \x01(\r\x12;\n\x03\x61\x63t\x18\n \x01(\x0b\x32,.robotsystemcommunication.RobotActionRequestH\x00\x12:\n\x04ping\x18\x0b \x01(\x0b\x32*.robotsystemcommunication.RobotPingRequestH\x00\x12\x42\n\x05\x62\x61tch\x18\x0c \x01(\x0b\x32\x31.robotsystemcommunication.RobotBatchActionRequestH\x00\x42\x05\n\x03req\"\xb8\x01\n\rRobotResponse\x12\r\n\x05reqId\x18\x01 \x01(\r\x12\x15\n\rarucoMarkerID\x18\x02 \x01(\x05\x12<\n\x03\x61\x63t\x18\n \x01(\x0b\x32-.robotsystemcommunication.RobotActionResponseH\x00\x12;\n\x04ping\x18\x0b \x01(\x0b\x32+.robotsystemcommunication.RobotPingResponseH\x00\x42\x06\n\x04resp\"M\n\x13\x42rainActionResponse\x12\x36\n\x07\x61\x63tions\x18\x01 \x03(\x0b\x32%.robotsystemcommunication.RobotAction\"4\n\x0bRobotAction\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\x05\x12\x15\n\rarucoMarkerID\x18\x02 \x01(\x05\"R\n\x12\x42rainActionRequest\x12<\n\x0cobservations\x18\x01 \x03(\x0b\x32&.robotsystemcommunication.Observations\"\xf2\x01\n\x0cObservations\x12\x19\n\x11lowerObservations\x18\x01 \x03(\x02\x12\x19\n\x11upperObservations\x18\x02 \x03(\x02\x12\x15\n\rarucoMarkerID\x18\x03 \x01(\x05\x12?\n\x08\x65ncoding\x18\x04 \x01(\x0e\x32-.robotsystemcommunication.ObservationEncoding\x12\x1f\n\x17lowerObservationsPacked\x18\x05 \x01(\x0c\x12\x1f\n\x17upperObservationsPacked\x18\x06 \x01(\x0c\x12\x12\n\nsectorSize\x18\x07 \x01(\x05\"b\n\x12\x42rainStreamRequest\x12\r\n\x05seqId\x18\x01 \x01(\r\x12=\n\x07request\x18\x02 \x01(\x0b\x32,.robotsystemcommunication.BrainActionRequest\"e\n\x13\x42rainStreamResponse\x12\r\n\x05seqId\x18\x01 \x01(\r\x12?\n\x08response\x18\x02 \x01(\x0b\x32-.robotsystemcommunication.BrainActionResponse\"0\n\x1fSimulationScreenCaptureResponse\x12\r\n\x05image\x18\x01 \x01(\x0c\"\x8b\x01\n\x1eSimulationScreenCaptureRequest\x12\x0e\n\x06height\x18\x01 \x01(\x05\x12\r\n\x05widht\x18\x02 \x01(\x05\x12\x36\n\timageType\x18\x03 \x01(\x0e\x32#.robotsystemcommunication.ImageType\x12\x12\n\njpgQuality\x18\x04 \x01(\x05\"Q\n\x17SimulationActionRequest\x12\x36\n\x07\x61\x63tions\x18\x01 \x03(\x0b\x32%.robotsystemcommunication.RobotAction\"P\n\x18SimulationActionResponse\x12\x34\n\x06status\x18\x01 \x01(\x0e\x32$.robotsystemcommunication.StatusType*,\n\nStatusType\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x06\n\x02OK\x10\x01\x12\t\n\x05\x45RROR\x10\x02*\x1d\n\tImageType\x12\x07\n\x03JPG\x10\x00\x12\x07\n\x03PNG\x10\x01*^\n\x13ObservationEncoding\x12\x0e\n\nFLOAT_LIST\x10\x00\x12\x0b\n\x07\x46LOAT32\x10\x01\x12\x15\n\x11\x46LOAT16_DISTANCES\x10\x02\x12\x13\n\x0fUINT8_DISTANCES\x10\x03\x32|\n\rRobotFrontend\x12k\n\nMakeAction\x12,.robotsystemcommunication.RobotActionRequest\x1a-.robotsystemcommunication.RobotActionResponse\"\x00\x32\xed\x01\n\x0b\x42rainServer\x12j\n\tGetAction\x12,.robotsystemcommunication.BrainActionRequest\x1a-.robotsystemcommunication.BrainActionResponse\"\x00\x12r\n\rStreamActions\x12,.robotsystemcommunication.BrainStreamRequest\x1a-.robotsystemcommunication.BrainStreamResponse\"\x00(\x01\x30\x01\x32\x95\x02\n\x10SimulationServer\x12\x89\x01\n\x10GetScreenCapture\x12\x38.robotsystemcommunication.SimulationScreenCaptureRequest\x1a\x39.robotsystemcommunication.SimulationScreenCaptureResponse\"\x00\x12u\n\nMakeAction\x12\x31.robotsystemcommunication.SimulationActionRequest\x1a\x32.robotsystemcommunication.SimulationActionResponse\"\x00\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.RobotSystemCommunication_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _STATUSTYPE._serialized_start=1946
+  _STATUSTYPE._serialized_end=1990
+  _IMAGETYPE._serialized_start=1992
+  _IMAGETYPE._serialized_end=2021
+  _OBSERVATIONENCODING._serialized_start=2023
+  _OBSERVATIONENCODING._serialized_end=2117
+  _ROBOTACTIONREQUEST._serialized_start=66
+  _ROBOTACTIONREQUEST._serialized_end=160
+  _ROBOTACTIONRESPONSE._serialized_start=162
+  _ROBOTACTIONRESPONSE._serialized_end=237
+  _ROBOTPINGREQUEST._serialized_start=239
+  _ROBOTPINGREQUEST._serialized_end=257
+  _ROBOTPINGRESPONSE._serialized_start=259
+  _ROBOTPINGRESPONSE._serialized_end=317
+  _ROBOTBATCHACTION._serialized_start=319
+  _ROBOTBATCHACTION._serialized_end=419
+  _ROBOTBATCHACTIONREQUEST._serialized_start=421
+  _ROBOTBATCHACTIONREQUEST._serialized_end=507
+  _ROBOTREQUEST._serialized_start=510
+  _ROBOTREQUEST._serialized_end=735
+  _ROBOTRESPONSE._serialized_start=738
+  _ROBOTRESPONSE._serialized_end=922
+  _BRAINACTIONRESPONSE._serialized_start=924
+  _BRAINACTIONRESPONSE._serialized_end=1001
+  _ROBOTACTION._serialized_start=1003
+  _ROBOTACTION._serialized_end=1055
+  _BRAINACTIONREQUEST._serialized_start=1057
+  _BRAINACTIONREQUEST._serialized_end=1139
+  _OBSERVATIONS._serialized_start=1142
+  _OBSERVATIONS._serialized_end=1384
+  _BRAINSTREAMREQUEST._serialized_start=1386
+  _BRAINSTREAMREQUEST._serialized_end=1484
+  _BRAINSTREAMRESPONSE._serialized_start=1486
+  _BRAINSTREAMRESPONSE._serialized_end=1587
+  _SIMULATIONSCREENCAPTURERESPONSE._serialized_start=1589
+  _SIMULATIONSCREENCAPTURERESPONSE._serialized_end=1637
+  _SIMULATIONSCREENCAPTUREREQUEST._serialized_start=1640
+  _SIMULATIONSCREENCAPTUREREQUEST._serialized_end=1779
+  _SIMULATIONACTIONREQUEST._serialized_start=1781
+  _SIMULATIONACTIONREQUEST._serialized_end=1862
+  _SIMULATIONACTIONRESPONSE._serialized_start=1864
+  _SIMULATIONACTIONRESPONSE._serialized_end=1944
+  _ROBOTFRONTEND._serialized_start=2119
+  _ROBOTFRONTEND._serialized_end=2243
+  _BRAINSERVER._serialized_start=2246
+  _BRAINSERVER._serialized_end=2483
+  _SIMULATIONSERVER._serialized_start=2486
+  _SIMULATIONSERVER._serialized_end=2763
 # @@protoc_insertion_point(module_scope)
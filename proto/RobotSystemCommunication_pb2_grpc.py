@@ -80,6 +80,11 @@ class BrainServerStub(object):
                 request_serializer=proto_dot_RobotSystemCommunication__pb2.BrainActionRequest.SerializeToString,
                 response_deserializer=proto_dot_RobotSystemCommunication__pb2.BrainActionResponse.FromString,
                 )
+        self.StreamActions = channel.stream_stream(
+                '/robotsystemcommunication.BrainServer/StreamActions',
+                request_serializer=proto_dot_RobotSystemCommunication__pb2.BrainStreamRequest.SerializeToString,
+                response_deserializer=proto_dot_RobotSystemCommunication__pb2.BrainStreamResponse.FromString,
+                )
 
 
 class BrainServerServicer(object):
@@ -91,6 +96,13 @@ class BrainServerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamActions(self, request_iterator, context):
+        """One stream stays open for the whole game
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_BrainServerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -99,6 +111,11 @@ def add_BrainServerServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_RobotSystemCommunication__pb2.BrainActionRequest.FromString,
                     response_serializer=proto_dot_RobotSystemCommunication__pb2.BrainActionResponse.SerializeToString,
             ),
+            'StreamActions': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamActions,
+                    request_deserializer=proto_dot_RobotSystemCommunication__pb2.BrainStreamRequest.FromString,
+                    response_serializer=proto_dot_RobotSystemCommunication__pb2.BrainStreamResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'robotsystemcommunication.BrainServer', rpc_method_handlers)
@@ -126,6 +143,23 @@ class BrainServer(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def StreamActions(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/robotsystemcommunication.BrainServer/StreamActions',
+            proto_dot_RobotSystemCommunication__pb2.BrainStreamRequest.SerializeToString,
+            proto_dot_RobotSystemCommunication__pb2.BrainStreamResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
 
 class SimulationServerStub(object):
     """Missing associated documentation comment in .proto file."""
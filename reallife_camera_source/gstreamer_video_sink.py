@@ -1,16 +1,25 @@
 #!/usr/bin/env python
 
 import traceback
+import threading
+import itertools
+import time
 import cv2
 import gi
 import numpy as np
-from multiprocessing import Lock, Array
+from multiprocessing import Array
 import ctypes
 
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst
 
 
+# Frames are written to a ring of buffers so a new frame never overwrites
+# the latest frame nor the frames being read. One buffer is being written,
+# one holds the latest frame and the rest can be held by readers.
+FRAME_BUFFER_COUNT = 4
+
+
 class GStreamerVideoSink():
     """BlueRov video capture class constructor
     Attributes:
@@ -35,8 +44,18 @@ class GStreamerVideoSink():
         self._width = params['ai_video_streamer']['capture_width']
         self._height = params['ai_video_streamer']['capture_height']
 
-        self._frame = None
-        self._mutex = Lock()
+        self._frame_buffers = None
+        self._buffer_sequences = [0] * FRAME_BUFFER_COUNT
+        self._buffer_timestamps = [0.0] * FRAME_BUFFER_COUNT
+        # Release tokens of the readers holding each buffer
+        self._buffer_readers = [set() for _ in range(FRAME_BUFFER_COUNT)]
+        self._reader_ids = itertools.count()
+        self._latest_buffer = -1
+        self._sequence = 0
+        self._dropped_frames = 0
+        self._read_sequence = 0
+        self._read_timestamp = 0.0
+        self._new_frame_condition = threading.Condition()
 
         self.video_source = \
             f'udpsrc multicast-group={multicast_ip} ' \
@@ -54,8 +73,8 @@ class GStreamerVideoSink():
         self.video_sink = None
 
         self._image_size = (self._width, self._height, 3)
-        arr_size = self._width * self._height * 3
-        self._shared_arr = Array(ctypes.c_uint8, arr_size)
+        arr_size = FRAME_BUFFER_COUNT * self._width * self._height * 3
+        self._shared_arr = Array(ctypes.c_uint8, arr_size, lock=False)
         # self.video_capture_image = np.frombuffer(
         #     self._shared_arr.get_obj(),
         #     dtype=np.uint8)
@@ -84,24 +103,29 @@ class GStreamerVideoSink():
             raise Exception("video_sink is NONE")
 
     @staticmethod
-    def _gst_to_opencv(sample):
+    def _copy_sample(sample, destination):
         """
-        Transform byte array into np array
+        Copy the image of a sample to a frame buffer. The sample's buffer
+        is mapped for reading so the image is copied only once.
         Args:
-            sample (TYPE): Description
-        Returns:
-            TYPE: Description
+            sample (Gst.Sample): Sample pulled from the appsink
+            destination (numpy.array(uint8)): Frame buffer
         """
         buf = sample.get_buffer()
         caps = sample.get_caps()
-        array = np.ndarray(
-            (
-                caps.get_structure(0).get_value('height'),
-                caps.get_structure(0).get_value('width'),
-                3
-            ),
-            buffer=buf.extract_dup(0, buf.get_size()), dtype=np.uint8)
-        return array
+        shape = (
+            caps.get_structure(0).get_value('height'),
+            caps.get_structure(0).get_value('width'),
+            3
+        )
+        success, map_info = buf.map(Gst.MapFlags.READ)
+        if not success:
+            raise Exception("\n=====\nCan't map the GStreamer buffer\n=====\n")
+        try:
+            image = np.ndarray(shape, buffer=map_info.data, dtype=np.uint8)
+            np.copyto(destination, image)
+        finally:
+            buf.unmap(map_info)
 
     def _crop_center(self, image, cropped_width, cropped_height):
         height, width, _ = image.shape
@@ -116,14 +140,78 @@ class GStreamerVideoSink():
     def _resize(self, image, width, height):
         return cv2.resize(image, (width, height))
 
+    @property
+    def frame_sequence(self):
+        """
+        Returns : int
+            Sequence number of the frame returned by the latest frame()
+            call. The numbers increase by one for every received frame.
+        """
+        return self._read_sequence
+
+    @property
+    def frame_timestamp(self):
+        """
+        Returns : float
+            Time, as given by time.time(), when the frame returned by the
+            latest frame() call was received
+        """
+        return self._read_timestamp
+
+    @property
+    def dropped_frames(self):
+        """
+        Returns : int
+            Number of received frames dropped because readers were holding
+            all the frame buffers
+        """
+        return self._dropped_frames
+
+    def acquire_frame(self):
+        """
+        Get a read-only view of the latest frame without copying it. The
+        frame buffer isn't overwritten until release_frame is called with
+        the returned token. The reader doesn't take a lock.
+        Returns : tuple(numpy.array(int8), tuple(int, int))
+            Read-only image and its release token
+        """
+        reader_id = next(self._reader_ids)
+        while True:
+            index = self._latest_buffer
+            if index < 0:
+                raise Exception("\n=====\nNo frame available\n=====\n")
+            self._buffer_readers[index].add(reader_id)
+            # The writer never writes to the latest buffer so the buffer is
+            # safe to read if it still is the latest one after holding it
+            if index == self._latest_buffer:
+                break
+            self._buffer_readers[index].discard(reader_id)
+
+        self._read_sequence = self._buffer_sequences[index]
+        self._read_timestamp = self._buffer_timestamps[index]
+        frame = self._frame_buffers[index].view()
+        frame.flags.writeable = False
+        return frame, (index, reader_id)
+
+    def release_frame(self, token):
+        """
+        Release a frame got with acquire_frame so its buffer can be reused
+        Args:
+            token (tuple(int, int)): Release token from acquire_frame
+        """
+        index, reader_id = token
+        self._buffer_readers[index].discard(reader_id)
+
     def frame(self):
         """
-        Get Frame
+        Get a copy of the latest frame
         Returns : numpy.array(int8)
             Image as a numpy array
         """
-        with self._mutex:
-            return np.copy(self._frame)
+        frame, token = self.acquire_frame()
+        frame = np.copy(frame)
+        self.release_frame(token)
+        return frame
 
     def frame_available(self):
         """
@@ -131,28 +219,40 @@ class GStreamerVideoSink():
         Returns : boolean
             true if frame is available otherwise false
         """
-        with self._mutex:
-            available = type(self._frame) != type(None)
-        return available
+        return self._latest_buffer >= 0
+
+    def wait_for_new_frame(self, timeout=None):
+        """
+        Wait until a frame newer than the one returned by the latest
+        frame() call has been received.
+        Args:
+            timeout (float): Seconds to wait. None waits forever.
+        Returns : boolean
+            true if a new frame is available otherwise false
+        """
+        with self._new_frame_condition:
+            return self._new_frame_condition.wait_for(
+                lambda: self._sequence > self._read_sequence,
+                timeout)
 
     def stop(self):
         if self.video_pipe is not None:
             self.video_pipe.set_state(Gst.State.NULL)
             self.video_pipe = None
             self.video_sink = None
-            self._mutex = None
 
     def _run(self):
         """
-        Get frame to update _frame
+        Start the pipeline which writes the frames to the frame buffers
         """
         try:
             self._image_size = (self._width, self._height, 3)
-            self._frame = np.frombuffer(
-                self._shared_arr.get_obj(),
+            self._frame_buffers = np.frombuffer(
+                self._shared_arr,
                 dtype=np.uint8)
-            self._frame = \
-                np.reshape(self._frame, self._image_size)
+            self._frame_buffers = np.reshape(
+                self._frame_buffers,
+                (FRAME_BUFFER_COUNT,) + self._image_size)
 
             self._start_gst(
                 [
@@ -167,19 +267,36 @@ class GStreamerVideoSink():
 
     def _callback(self, sink):
         sample = sink.emit('pull-sample')
-        new_frame = self._gst_to_opencv(sample)
-        with self._mutex:
-            try:
-                self._frame[:] = new_frame
-            except ValueError as error:
-                traceback.print_exc()
-                print('\n=====\n'
-                      'Got unexpected exception in "GStreamerVideoSink"'
-                      f'Message: {error}\n=====\n')
-                raise Exception(
-                    "\n=====\nCan't get image. Maybe the incoming image "
-                    f"size is different than {self._width}x{self._height} "
-                    "which was expected\n=====\n")
+        timestamp = time.time()
+
+        # Write to a buffer which is neither the latest frame nor
+        # held by a reader
+        index = next(
+            (i for i in range(FRAME_BUFFER_COUNT)
+             if i != self._latest_buffer and not self._buffer_readers[i]),
+            None)
+        if index is None:
+            self._dropped_frames += 1
+            return Gst.FlowReturn.OK
+
+        try:
+            self._copy_sample(sample, self._frame_buffers[index])
+        except ValueError as error:
+            traceback.print_exc()
+            print('\n=====\n'
+                  'Got unexpected exception in "GStreamerVideoSink"'
+                  f'Message: {error}\n=====\n')
+            raise Exception(
+                "\n=====\nCan't get image. Maybe the incoming image "
+                f"size is different than {self._width}x{self._height} "
+                "which was expected\n=====\n")
+
+        with self._new_frame_condition:
+            self._sequence += 1
+            self._buffer_timestamps[index] = timestamp
+            self._buffer_sequences[index] = self._sequence
+            self._latest_buffer = index
+            self._new_frame_condition.notify_all()
 
         return Gst.FlowReturn.OK
 
@@ -197,7 +314,7 @@ if __name__ == '__main__':
 
     while True:
         # Wait for the next frame
-        if not video.frame_available():
+        if not video.wait_for_new_frame(timeout=1):
             continue
 
         frame = video.frame()
@@ -77,12 +77,19 @@ def _setup_variables(mode):
             "totalDurationFPS": -1,
             "imageCaptureDuration": -1,
             "obsCreationDuration": -1,
+            "arucoDetectionDuration": -1,
+            "ecoreDetectionDuration": -1,
+            "obsStepDuration": -1,
             "brainDuration": -1,
+            "lateBrainResponses": 0,
+            "droppedBrainResponses": 0,
             "frontendDuration": -1,
+            "photonToMotorAge": -1,
             "status": "Initialized",
             "lowerObs": [],
             "upperObs": [],
-            "angles": []
+            "angles": [],
+            "viewerHeartbeat": -1
         })
 
     return shared_image, shared_array, shared_state, shared_data
@@ -96,6 +103,8 @@ def _generate_image():
             raise Exception("Error in game")
 
         start_time = time.time()
+        # Tell the game that someone is watching the game view
+        SHARED_DATA['viewerHeartbeat'] = start_time
         with SHARED_ARRAY.get_lock():
             (flag, encodedImage) = cv2.imencode(".jpg", SHARED_IMAGE)
 